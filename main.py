@@ -1,20 +1,33 @@
 import asyncio
+import atexit
+import bisect
+import concurrent.futures
+import functools
+import itertools
 import json
+import mmap
 import os
 import logging
+import logging.handlers
+import queue
 import sys
 import locale
+import tarfile
 import ctypes
 import traceback
 import shutil
+import sqlite3
 import re
+import time
 import urllib.request
-from datetime import datetime, timezone, timedelta
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timezone, timedelta
 from typing import Dict, Optional, List, Set, Tuple
-from aiohttp import ClientSession, ClientError, ClientResponseError
+from aiohttp import ClientSession, ClientError, ClientResponseError, ClientTimeout, TCPConnector
 from aiogram import Bot, Dispatcher, types, F
+from aiogram.enums import ParseMode
 from aiogram.filters import CommandStart, Command
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, LinkPreviewOptions
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from bs4 import BeautifulSoup
@@ -28,6 +41,100 @@ except ImportError:
     MODERN_FORMATTER_AVAILABLE = False
     logging.warning("Современный форматтер не доступен, используются базовые функции")
 
+# Быстрый JSON-кодек (при наличии)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Потоковый разбор больших JSON-файлов (при наличии)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+def json_loads(data: bytes):
+    """Разбирает JSON из байтов (orjson, если доступен)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> bytes:
+    """Сериализует объект в компактный JSON в виде UTF-8 байтов (orjson, если доступен)
+
+    Файлы данных читает только бот, поэтому отступы не используются.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def read_json_file(path: str):
+    """Читает и разбирает JSON-файл
+
+    С orjson файл отображается в память (mmap) и разбирается напрямую,
+    без промежуточной копии всего содержимого в bytes.
+    """
+    with open(path, 'rb') as f:
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        return json_loads(f.read())
+
+def write_file_atomic(path: str, data: bytes):
+    """Атомарно заменяет содержимое файла: запись во временный файл, fsync и os.replace
+
+    При сбое во время записи на диске остается прежняя версия файла.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Запись и fsync файлов данных выполняет один фоновый поток: записи идут по очереди,
+# поэтому более позднее содержимое файла всегда оказывается на диске последним
+_file_writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-writer')
+
+def _write_file_logged(path: str, data: bytes):
+    try:
+        write_file_atomic(path, data)
+    except OSError as e:
+        logger.error(f"Ошибка записи файла {path}: {e}")
+
+def write_file_background(path: str, data: bytes):
+    """Записывает файл атомарно, не блокируя цикл событий
+
+    Данные сериализуются вызывающим кодом заранее, в потоке выполняется только
+    запись на диск. Вне цикла событий (при запуске, из задач планировщика в пуле
+    потоков) вызов дожидается записи - через тот же поток, чтобы не пересечься
+    с записями, уже стоящими в очереди. Ошибки записи в этом случае пробрасываются.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _file_writer.submit(write_file_atomic, path, data).result()
+        return
+    _file_writer.submit(_write_file_logged, path, data)
+
+def close_file_writer():
+    """Дожидается завершения всех отложенных записей файлов"""
+    _file_writer.shutdown(wait=True)
+
+# Мониторинг ресурсов системы (при наличии)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Память собственного процесса на POSIX читается без psutil
+try:
+    import resource
+except ImportError:
+    resource = None
+
 # --- НАСТРОЙКА КОДИРОВКИ ДЛЯ WINDOWS ---
 if sys.platform == "win32":
     # Включаем поддержку UTF-8 в консоли Windows
@@ -49,9 +156,18 @@ BOT_TOKEN = os.getenv("BOT_TOKEN")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", None)
 CHANNEL_ID = os.getenv("CHANNEL_ID")
 ADMIN_ID = int(os.getenv("ADMIN_ID", "0"))
+# Множество администраторов для проверки прав за O(1)
+_ADMINS = frozenset({ADMIN_ID}) if ADMIN_ID else frozenset()
+ACCESS_DENIED_MESSAGE = "⛔ У вас нет прав для выполнения этой команды."
 DONATE_URL = "https://boosty.to/vokforever/donate"
+
+# Общие параметры отправки сообщений (создаются один раз)
+_MD = ParseMode.MARKDOWN
+_NOPREV = LinkPreviewOptions(is_disabled=True)
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+CHECK_ALL_CONCURRENCY = 10  # Одновременных запросов к GitHub API (размер пула соединений)
+GITHUB_REQUEST_TIMEOUT = 30  # Секунд на один запрос к GitHub API
 HISTORY_DAYS = 30
 PRIORITY_UPDATE_DAYS = 7
 
@@ -70,6 +186,7 @@ REPOS = [
     "alephium/gpu-miner",
     "GoldenMinerNetwork/golden-miner-nockchain-gpu-miner"
 ]
+REPOS_SET = frozenset(REPOS)  # Для проверок принадлежности; список задает порядок обхода
 
 # --- ПАРАМЕТРЫ ПРИОРИТЕТНОЙ ПРОВЕРКИ ---
 MIN_CHECK_INTERVAL_MINUTES = 15
@@ -77,13 +194,30 @@ MAX_CHECK_INTERVAL_MINUTES = 1440
 PRIORITY_THRESHOLD_HIGH = 0.5
 PRIORITY_THRESHOLD_LOW = 0.1
 DEFAULT_CHECK_INTERVAL_MINUTES = 360  # 6 часов
+# Проверка запускается к ближайшему сроку репозитория, но не реже чем раз в этот период
+MAX_CHECK_SLEEP_MINUTES = 60
 
 # --- ФАЙЛЫ ХРАНЕНИЯ ДАННЫХ ---
 STATE_FILE = "last_releases.json"
 FILTERS_FILE = "user_filters.json"
 HISTORY_FILE = "releases_history.json"
+# Историю больше этого размера разбираем потоково (если установлен ijson)
+HISTORY_STREAM_THRESHOLD_BYTES = 10 * 1024 * 1024
 USERS_FILE = "users.json"
 STATISTICS_FILE = "bot_statistics.json"
+RELEASE_CACHE_FILE = "github_cache.db"
+RELEASE_CACHE_MAX_ENTRIES = 100
+RELEASE_BODY_MAX_LENGTH = 4000  # Описание релиза в уведомлении все равно обрезается до 1000
+
+# Файлы данных с описаниями (для /debug)
+DATA_FILES_INFO = (
+    (STATE_FILE, "Состояние релизов"),
+    (FILTERS_FILE, "Фильтры пользователей"),
+    (HISTORY_FILE, "История релизов"),
+    (USERS_FILE, "База пользователей"),
+    (STATISTICS_FILE, "Статистика бота"),
+    (RELEASE_CACHE_FILE, "Кэш ответов GitHub"),
+)
 
 # Создаем папку для резервных копий
 BACKUP_DIR = "backups"
@@ -91,6 +225,8 @@ if not os.path.exists(BACKUP_DIR):
     os.makedirs(BACKUP_DIR)
 
 # --- УЛУЧШЕННОЕ ЛОГИРОВАНИЕ ---
+LOG_BACKUP_DAYS = 30  # Сколько ротированных лог-файлов хранить
+
 def setup_logging():
     """Настройка системы логирования"""
     # Создаем папку для логов
@@ -103,18 +239,19 @@ def setup_logging():
         '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
     )
     
-    # Основной лог-файл
-    file_handler = logging.FileHandler(
-        f'{log_dir}/bot_{datetime.now().strftime("%Y%m%d")}.log', 
-        encoding='utf-8'
+    # Основной лог-файл: ротация в полночь (bot.log.ГГГГ-ММ-ДД), файл создается
+    # при первой записи
+    file_handler = logging.handlers.TimedRotatingFileHandler(
+        f'{log_dir}/bot.log', when='midnight', backupCount=LOG_BACKUP_DAYS,
+        encoding='utf-8', delay=True
     )
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.INFO)
     
-    # Лог ошибок
-    error_handler = logging.FileHandler(
-        f'{log_dir}/errors_{datetime.now().strftime("%Y%m%d")}.log',
-        encoding='utf-8'
+    # Лог ошибок (создается только при первой ошибке)
+    error_handler = logging.handlers.TimedRotatingFileHandler(
+        f'{log_dir}/errors.log', when='midnight', backupCount=LOG_BACKUP_DAYS,
+        encoding='utf-8', delay=True
     )
     error_handler.setFormatter(formatter)
     error_handler.setLevel(logging.ERROR)
@@ -124,18 +261,54 @@ def setup_logging():
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
     
+    # Запись в файлы и консоль выполняет фоновый поток: код в цикле событий
+    # только кладет записи в очередь и не блокируется на вводе-выводе
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, error_handler, console_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Имена потоков и процессов в формате не используются
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Настройка корневого логгера
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     return logging.getLogger(__name__)
 
 logger = setup_logging()
 
 # --- ФУНКЦИЯ ОЧИСТКИ MARKDOWN ---
+# Регулярные выражения компилируются один раз при загрузке модуля
+_RE_MD_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_RE_MD_ITALIC = re.compile(r'__(.*?)__')
+_RE_MD_CODE = re.compile(r'```(.*?)```')
+_RE_MD_STRIKE = re.compile(r'~~(.*?)~~')
+_RE_MD_CHARS = re.compile(r'[\*_~`|]')
+# HTML теги и символы Markdown удаляются за один проход
+_RE_MARKUP = re.compile(r'<[^>]+>|[\*_~`|]')
+_RE_HTML_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_RE_BRACKETS = re.compile(r'\[.*?\]')
+_RE_BRACES = re.compile(r'\{.*?\}')
+# Ссылки и изображения ![alt](url) одним выражением
+_RE_MD_LINK = re.compile(r'!?\[.*?\]\(.*?\)')
+# Группа 1 - три и более переносов строк, группа 2 - серия пробелов
+_RE_WHITESPACE = re.compile(r'(\n\s*\n\s*\n)|( +)')
+
+def _whitespace_replacement(match: re.Match) -> str:
+    return '\n\n' if match.group(1) else ' '
+
+def normalize_whitespace(text: str) -> str:
+    """Оставляет максимум 2 переноса строк подряд и схлопывает пробелы за один проход"""
+    return _RE_WHITESPACE.sub(_whitespace_replacement, text)
+
 def clean_markdown_text(text: str) -> str:
     """
     Удаляет символы Markdown форматирования из текста
@@ -143,23 +316,9 @@ def clean_markdown_text(text: str) -> str:
     if not text:
         return text
     
-    # Удаляем жирное форматирование **text**
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    
-    # Удаляем курсив __text__
-    text = re.sub(r'__(.*?)__', r'\1', text)
-    
-    # Удаляем моноширинный ```text```
-    text = re.sub(r'```(.*?)```', r'\1', text)
-    
-    # Удаляем зачеркнутый ~~text~~
-    text = re.sub(r'~~(.*?)~~', r'\1', text)
-    
-    # Удаляем скрытый ||text||
-    text = re.sub(r'\|\|(.*?)\|\|', r'\1', text)
-    
-    # Удаляем одиночные символы форматирования, которые могут остаться
-    text = re.sub(r'[\*_~`|]', '', text)
+    # Все разделители (**, __, ```, ~~, ||) состоят из этих символов,
+    # поэтому одного прохода достаточно: содержимое остается, разметка удаляется
+    text = _RE_MD_CHARS.sub('', text)
     
     return text.strip()
 
@@ -170,51 +329,32 @@ def clean_text_for_telegram(text: str) -> str:
     if not text:
         return text
     
-    # Удаляем HTML/XML теги
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Удаляем Markdown форматирование
-    text = clean_markdown_text(text)
+    # Удаляем HTML/XML теги и Markdown форматирование
+    text = _RE_MARKUP.sub('', text).strip()
     
     # Дополнительная очистка от специфичных артефактов
-    text = re.sub(r'\[.*?\]', '', text)  # Удаляем текст в квадратных скобках
-    text = re.sub(r'\{.*?\}', '', text)  # Удаляем текст в фигурных скобках
+    text = _RE_BRACKETS.sub('', text)  # Удаляем текст в квадратных скобках
+    text = _RE_BRACES.sub('', text)  # Удаляем текст в фигурных скобках
     
     # Удаляем лишние пробелы и переносы строк
-    text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)  # Максимум 2 пустые строки подряд
-    text = re.sub(r' +', ' ', text)  # Убираем множественные пробелы
+    text = normalize_whitespace(text)
     
     return text.strip()
 
+# Таблицы экранирования строятся один раз при загрузке модуля
+_MD_ESCAPE_CHARS = '_*[]()~`>#+='
+_MD_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in _MD_ESCAPE_CHARS})
+_RE_MD_ESCAPED = re.compile(r'\\([' + re.escape(_MD_ESCAPE_CHARS) + r'])')
+_MD_V2_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in '_*[]()~`>#+=|{}.!'})
+
 def escape_markdown(text: str) -> str:
     """Экранирует специальные символы Markdown (не MarkdownV2)"""
     if not text:
         return ""
 
-    # Список символов, которые нужно экранировать в Markdown
-    escape_chars = '_*[]()~`>#+='
-
-    # Сначала удаляем существующие экранирующие слэши перед этими символами
-    cleaned_text = ""
-    i = 0
-    while i < len(text):
-        if text[i] == '\\' and i + 1 < len(text) and text[i + 1] in escape_chars:
-            # Пропускаем обратный слэш, оставляем только символ
-            cleaned_text += text[i + 1]
-            i += 2
-        else:
-            cleaned_text += text[i]
-            i += 1
-
-    # Теперь экранируем нужные символы
-    escaped_text = ""
-    for char in cleaned_text:
-        if char in escape_chars:
-            escaped_text += f'\\{char}'
-        else:
-            escaped_text += char
-
-    return escaped_text
+    # Сначала удаляем существующие экранирующие слэши перед этими символами,
+    # затем экранируем нужные символы
+    return _RE_MD_ESCAPED.sub(r'\1', text).translate(_MD_ESCAPE_TABLE)
 
 def escape_markdown_v2(text: str) -> str:
     """
@@ -223,17 +363,7 @@ def escape_markdown_v2(text: str) -> str:
     if not text:
         return ""
     
-    # Список символов для MarkdownV2
-    escape_chars = '_*[]()~`>#+=|{}.!'
-    
-    escaped_text = ""
-    for char in text:
-        if char in escape_chars:
-            escaped_text += f'\\{char}'
-        else:
-            escaped_text += char
-    
-    return escaped_text
+    return text.translate(_MD_V2_ESCAPE_TABLE)
 
 def validate_telegram_text(text: str, max_length: int = 4096) -> str:
     """
@@ -281,13 +411,11 @@ def clean_github_release_body(body: str, max_length: int = 1000) -> str:
     cleaned = clean_markdown_text(body.strip())
     
     # Удаляем специфичные для GitHub элементы
-    cleaned = re.sub(r'<!--.*?-->', '', cleaned, flags=re.DOTALL)  # HTML комментарии
-    cleaned = re.sub(r'\[.*?\]\(.*?\)', '', cleaned)  # Markdown ссылки
-    cleaned = re.sub(r'!\[.*?\]\(.*?\)', '', cleaned)  # Markdown изображения
+    cleaned = _RE_HTML_COMMENT.sub('', cleaned)  # HTML комментарии
+    cleaned = _RE_MD_LINK.sub('', cleaned)  # Markdown ссылки и изображения
     
     # Убираем лишние пробелы и переносы
-    cleaned = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned)
-    cleaned = re.sub(r' +', ' ', cleaned)
+    cleaned = normalize_whitespace(cleaned)
     
     # Ограничиваем длину
     if len(cleaned) > max_length:
@@ -358,13 +486,13 @@ def convert_markdown_to_html(text: str) -> str:
         return text
     
     # Жирный текст
-    text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
+    text = _RE_MD_BOLD.sub(r'<b>\1</b>', text)
     
     # Курсив
-    text = re.sub(r'__(.*?)__', r'<i>\1</i>', text)
+    text = _RE_MD_ITALIC.sub(r'<i>\1</i>', text)
     
     # Моноширинный
-    text = re.sub(r'```(.*?)```', r'<code>\1</code>', text)
+    text = _RE_MD_CODE.sub(r'<code>\1</code>', text)
 
 async def send_formatted_message(bot: Bot, chat_id: int, text: str, 
                                target_format: str = "auto", 
@@ -441,7 +569,7 @@ async def send_formatted_message(bot: Bot, chat_id: int, text: str,
         return False
     
     # Зачеркнутый
-    text = re.sub(r'~~(.*?)~~', r'<s>\1</s>', text)
+    text = _RE_MD_STRIKE.sub(r'<s>\1</s>', text)
     
     # Подчеркнутый
     text = re.sub(r'<u>(.*?)</u>', r'<u>\1</u>', text)
@@ -463,17 +591,71 @@ def clean_telegram_username(username: str) -> str:
     
     return username[:32]  # Telegram ограничение на длину username
 
+# --- КЭШИРОВАННОЕ ФОРМАТИРОВАНИЕ ТЕКУЩЕГО ВРЕМЕНИ ---
+_last_ts = (0, "")
+
+def now_str() -> str:
+    """Возвращает текущее локальное время в формате '%Y-%m-%d %H:%M:%S'
+
+    Отформатированная строка кэшируется в пределах одной секунды.
+    """
+    global _last_ts
+    now = int(time.time())
+    if now != _last_ts[0]:
+        _last_ts = (now, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)))
+    return _last_ts[1]
+
+def fmt_ts(ts: float) -> str:
+    """Форматирует время в секундах эпохи как ISO-строку UTC"""
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+# --- ОТЛОЖЕННАЯ ЗАПИСЬ ФАЙЛОВ ДАННЫХ ---
+SAVE_DEBOUNCE_SECONDS = 2.0
+
+class DebouncedWriter:
+    """Откладывает вызов функции сохранения на SAVE_DEBOUNCE_SECONDS
+
+    Все изменения за этот интервал записываются одним вызовом save_func.
+    Вне цикла событий (при запуске, из потоков) сохранение выполняется сразу.
+    """
+
+    def __init__(self, save_func, delay: float = SAVE_DEBOUNCE_SECONDS):
+        self.save_func = save_func
+        self.delay = delay
+        self._handle = None
+
+    def schedule(self):
+        if self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_func()
+            return
+        self._handle = loop.call_later(self.delay, self._run)
+
+    def _run(self):
+        self._handle = None
+        self.save_func()
+
+    def flush(self):
+        """Немедленно выполняет отложенное сохранение, если оно запланировано"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._run()
+
 # --- КЛАСС ДЛЯ УПРАВЛЕНИЯ СТАТИСТИКОЙ ---
 class StatisticsManager:
     def __init__(self):
         self.stats_file = STATISTICS_FILE
         self.stats = self._load_stats()
+        self._saver = DebouncedWriter(self._save_stats)
+        self._start_ts = None  # start_time в секундах эпохи, разбирается при первом запросе
 
     def _load_stats(self) -> Dict:
         if os.path.exists(self.stats_file):
             try:
-                with open(self.stats_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json_file(self.stats_file)
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Ошибка загрузки статистики: {e}")
         
@@ -490,8 +672,7 @@ class StatisticsManager:
     def _save_stats(self):
         try:
             self.stats['last_activity'] = datetime.now(timezone.utc).isoformat()
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2, ensure_ascii=False)
+            write_file_background(self.stats_file, json_dumps(self.stats))
         except IOError as e:
             logger.error(f"Ошибка сохранения статистики: {e}")
 
@@ -499,40 +680,74 @@ class StatisticsManager:
         self.stats['total_checks'] += 1
         if repo_name and repo_name in self.stats['repo_stats']:
             self.stats['repo_stats'][repo_name]['checks'] += 1
-        self._save_stats()
+        self._saver.schedule()
 
     def increment_releases(self, repo_name: str = None):
         self.stats['total_releases_found'] += 1
         if repo_name and repo_name in self.stats['repo_stats']:
             self.stats['repo_stats'][repo_name]['releases'] += 1
-        self._save_stats()
+        self._saver.schedule()
 
     def increment_notifications(self):
         self.stats['total_notifications_sent'] += 1
-        self._save_stats()
+        self._saver.schedule()
+
+    def record_release_notified(self, repo_name: str = None):
+        """Учитывает найденный релиз и отправку уведомлений одной записью файла"""
+        self.stats['total_notifications_sent'] += 1
+        self.stats['total_releases_found'] += 1
+        if repo_name and repo_name in self.stats['repo_stats']:
+            self.stats['repo_stats'][repo_name]['releases'] += 1
+        self._saver.schedule()
 
     def increment_errors(self):
         self.stats['errors_count'] += 1
-        self._save_stats()
+        self._saver.schedule()
 
     def get_uptime(self) -> str:
         try:
-            start_time = datetime.fromisoformat(self.stats['start_time'])
-            uptime = datetime.now(timezone.utc) - start_time
-            days = uptime.days
-            hours, remainder = divmod(uptime.seconds, 3600)
+            if self._start_ts is None:
+                self._start_ts = datetime.fromisoformat(self.stats['start_time']).timestamp()
+            days, remainder = divmod(int(time.time() - self._start_ts), 86400)
+            hours, remainder = divmod(remainder, 3600)
             minutes, _ = divmod(remainder, 60)
             return f"{days}д {hours}ч {minutes}м"
         except:
             return "Неизвестно"
 
+@functools.lru_cache(maxsize=1024)
+def _parse_published_at(value: str) -> datetime:
+    """Разбирает published_at релиза (одна и та же дата из истории разбирается один раз)"""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
 # --- УЛУЧШЕНЫЙ КЛАСС ДЛЯ УПРАВЛЕНИЯ ПРИОРИТЕТАМИ ---
 class RepositoryPriorityManager:
+    # Шаблон приоритета по умолчанию (все значения неизменяемые, достаточно поверхностной копии)
+    _DEFAULT_PRIORITY_TEMPLATE = {
+        'update_count': 0,
+        'last_update': None,
+        'check_interval': DEFAULT_CHECK_INTERVAL_MINUTES,
+        'priority_score': 0.0,
+        'last_check': None,
+        'consecutive_failures': 0,
+        'total_checks': 0,
+        'average_response_time': 0.0
+    }
+
     def __init__(self):
         self.priorities = {}
         self.last_priority_update = None
         self.supabase_manager = None
         self.db_synced = False
+        self._dirty: Set[str] = set()  # Репозитории с изменениями, еще не записанными в БД
+        self._last_fingerprint = None  # Отпечаток результата последнего update_priorities
+        self._saved_hashes: Dict[str, int] = {}  # Хэши записанных в БД данных по репозиториям
+        # Записи в БД выполняются по одной: иначе потоки могут завершиться не по порядку,
+        # и более старый снимок перезапишет более новый
+        self._save_lock = asyncio.Lock()
+        self._sorted_repos: Optional[List[Tuple[str, Dict]]] = None  # Кэш repos_by_priority()
         
         # Инициализируем SupabaseManager
         try:
@@ -558,7 +773,7 @@ class RepositoryPriorityManager:
                 db_priorities = {}
                 for record in result:
                     repo_name = record.get('repo_name')
-                    if repo_name in REPOS:
+                    if repo_name in REPOS_SET:
                         db_priorities[repo_name] = {
                             'update_count': record.get('update_count', 0),
                             'last_update': record.get('last_update'),
@@ -586,35 +801,39 @@ class RepositoryPriorityManager:
             logger.error(f"Ошибка загрузки приоритетов из БД: {e}")
             raise RuntimeError(f"Не удалось загрузить приоритеты из БД: {e}")
 
-    def initialize_priorities(self):
-        """Инициализирует приоритеты при запуске"""
+    async def initialize_priorities(self):
+        """Инициализирует приоритеты при запуске
+
+        Чтение из Supabase выполняется в отдельном потоке, а замена priorities -
+        в цикле событий, как и все остальные изменения priorities и _dirty.
+        """
         try:
-            self.priorities = self._load_priorities_from_db()
+            priorities = await asyncio.to_thread(self._load_priorities_from_db)
+            # После перезагрузки сравнивать с ранее записанными данными нельзя
+            self._saved_hashes = {}
+            self._sorted_repos = None
+            self.priorities = priorities
             self.last_priority_update = datetime.now(timezone.utc)
         except RuntimeError as e:
             if "SupabaseManager недоступен" in str(e):
                 logger.warning(f"Не удалось загрузить приоритеты из БД, используем значения по умолчанию: {e}")
                 # Создаем дефолтные приоритеты для всех репозиториев
+                self._saved_hashes = {}
                 self.priorities = {repo: self._create_default_priority() for repo in REPOS}
+                self._sorted_repos = None
                 self.last_priority_update = datetime.now(timezone.utc)
             else:
                 logger.error(f"Ошибка инициализации приоритетов: {e}")
                 raise
 
     def _create_default_priority(self) -> Dict:
-        return {
-            'update_count': 0,
-            'last_update': None,
-            'check_interval': DEFAULT_CHECK_INTERVAL_MINUTES,
-            'priority_score': 0.0,
-            'last_check': None,
-            'consecutive_failures': 0,
-            'total_checks': 0,
-            'average_response_time': 0.0
-        }
+        return self._DEFAULT_PRIORITY_TEMPLATE.copy()
 
-    def _save_priorities_to_db(self):
+    def _save_priorities_to_db(self, priorities: Optional[Dict[str, Dict]] = None):
         """Сохраняет приоритеты в базу данных Supabase"""
+        if priorities is None:
+            priorities = self.priorities
+
         if not self.supabase_manager:
             logger.error("SupabaseManager недоступен, невозможно сохранить приоритеты")
             raise RuntimeError("SupabaseManager недоступен")
@@ -622,7 +841,7 @@ class RepositoryPriorityManager:
         try:
             # Подготавливаем данные для сохранения
             priorities_data = {}
-            for repo_name, repo_data in self.priorities.items():
+            for repo_name, repo_data in priorities.items():
                 priorities_data[repo_name] = {
                     'update_count': repo_data.get('update_count', 0),
                     'last_update': repo_data.get('last_update'),
@@ -634,18 +853,42 @@ class RepositoryPriorityManager:
                     'average_response_time': repo_data.get('average_response_time', 0.0)
                 }
             
+            # Отправляем только репозитории, данные которых изменились с последней записи
+            # (updated_at в БД не обновляется без изменений)
+            changed_data = {}
+            new_hashes = {}
+            for repo_name, repo_data in priorities_data.items():
+                content_hash = hash(json_dumps(repo_data))
+                if self._saved_hashes.get(repo_name) != content_hash:
+                    changed_data[repo_name] = repo_data
+                    new_hashes[repo_name] = content_hash
+
+            if not changed_data:
+                logger.debug("Приоритеты не изменились с последнего сохранения, запись пропущена")
+                return
+
             # Сохраняем через SupabaseManager
-            self.supabase_manager.store_repository_priorities({'priorities': priorities_data})
-            logger.info(f"Приоритеты успешно сохранены в БД: {len(priorities_data)} репозиториев")
+            self.supabase_manager.store_repository_priorities({'priorities': changed_data})
+            self._saved_hashes.update(new_hashes)
+            logger.info(f"Приоритеты успешно сохранены в БД: {len(changed_data)} репозиториев")
 
         except Exception as e:
             logger.error(f"Ошибка сохранения приоритетов в БД: {e}")
             raise RuntimeError(f"Не удалось сохранить приоритеты в БД: {e}")
 
-    def _save_priorities(self):
-        """Основной метод сохранения - использует БД"""
+    def _save_priorities(self, *repos: str):
+        """Помечает приоритеты репозиториев как измененные (без аргументов - все)
+
+        Запись в БД откладывается до flush(), который выполняется по расписанию,
+        в конце проверки репозиториев и при остановке бота. priorities и _dirty
+        изменяются только в цикле событий; в потоки передаются лишь снимки.
+        """
+        self._dirty.update(repos or self.priorities)
+
+    def _save_priorities_sync(self, priorities: Dict[str, Dict]):
+        """Синхронно сохраняет снимок приоритетов в БД"""
         try:
-            self._save_priorities_to_db()
+            self._save_priorities_to_db(priorities)
         except RuntimeError as e:
             if "SupabaseManager недоступен" in str(e):
                 logger.warning(f"Не удалось сохранить приоритеты в БД: {e}")
@@ -653,6 +896,22 @@ class RepositoryPriorityManager:
                 logger.error(f"Ошибка сохранения приоритетов в БД: {e}")
                 raise
 
+    async def flush(self):
+        """Записывает накопленные изменения приоритетов в БД, не блокируя цикл событий"""
+        async with self._save_lock:
+            if not self._dirty:
+                return
+
+            # Снимок измененных записей делаем в потоке цикла событий,
+            # чтобы словарь не менялся во время записи
+            dirty, self._dirty = self._dirty, set()
+            snapshot = {repo: dict(self.priorities[repo]) for repo in dirty if repo in self.priorities}
+            try:
+                await asyncio.to_thread(self._save_priorities_sync, snapshot)
+            except Exception:
+                self._dirty |= dirty
+                raise
+
     def _get_priority_level(self, score: float) -> str:
         """Определяет уровень приоритета по score"""
         if score >= PRIORITY_THRESHOLD_HIGH:
@@ -674,15 +933,7 @@ class RepositoryPriorityManager:
     def get_priority(self, repo: str) -> Dict:
         if repo not in self.priorities:
             self.priorities[repo] = self._create_default_priority()
-            # Сохраняем в БД с обработкой ошибок
-            try:
-                self._save_priorities_to_db()
-            except RuntimeError as e:
-                if "SupabaseManager недоступен" in str(e):
-                    logger.warning(f"Не удалось сохранить приоритет в БД для {repo}: {e}")
-                else:
-                    logger.error(f"Ошибка сохранения приоритетов в БД для {repo}: {e}")
-                    raise
+            self._save_priorities(repo)
         return self.priorities[repo]
 
     def record_update(self, repo: str):
@@ -690,22 +941,16 @@ class RepositoryPriorityManager:
         priority_data['update_count'] += 1
         priority_data['last_update'] = datetime.now(timezone.utc).isoformat()
         priority_data['consecutive_failures'] = 0  # Сбрасываем счетчик ошибок
-        # Сохраняем в БД с обработкой ошибок
-        try:
-            self._save_priorities_to_db()
-        except RuntimeError as e:
-            if "SupabaseManager недоступен" in str(e):
-                logger.warning(f"Не удалось сохранить обновление в БД для {repo}: {e}")
-            else:
-                logger.error(f"Ошибка сохранения приоритетов в БД для {repo}: {e}")
-                raise
+        self._save_priorities(repo)
         logger.info(f"Зарегистрировано обновление для {repo}. Всего обновлений: {priority_data['update_count']}")
 
     def record_check(self, repo: str, success: bool = True, response_time: float = 0.0):
         """Записывает информацию о проверке репозитория"""
         priority_data = self.get_priority(repo)
         priority_data['total_checks'] += 1
-        priority_data['last_check'] = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
+        priority_data['last_check'] = now.isoformat()
+        priority_data['last_check_ts'] = now.timestamp()
         
         if success:
             priority_data['consecutive_failures'] = 0
@@ -719,40 +964,99 @@ class RepositoryPriorityManager:
         else:
             priority_data['consecutive_failures'] += 1
             
-        # Сохраняем в БД с обработкой ошибок
-        try:
-            self._save_priorities_to_db()
-        except RuntimeError as e:
-            if "SupabaseManager недоступен" in str(e):
-                logger.warning(f"Не удалось сохранить проверку в БД для {repo}: {e}")
-            else:
-                logger.error(f"Ошибка сохранения приоритетов в БД для {repo}: {e}")
-                raise
+        self._save_priorities(repo)
+
+    def record_last_check_bulk(self, repo_times: Dict[str, str]):
+        """Обновляет время последней проверки сразу для нескольких репозиториев
+
+        Изменения только помечаются, запись в БД выполняет flush().
+        """
+        if not repo_times:
+            return
+        for repo, checked_at in repo_times.items():
+            priority_data = self.get_priority(repo)
+            priority_data['last_check'] = checked_at
+            priority_data['last_check_ts'] = _parse_last_check(checked_at).timestamp()
+        self._save_priorities(*repo_times)
+
+    @staticmethod
+    def get_last_check_ts(priority_data: Dict) -> Optional[float]:
+        """Время последней проверки в секундах эпохи
+
+        ISO-строка last_check хранится для БД, а для сравнений используется
+        число last_check_ts (для загруженных из БД данных вычисляется один раз).
+        """
+        last_check_ts = priority_data.get('last_check_ts')
+        if last_check_ts is None:
+            last_check = priority_data.get('last_check')
+            if not last_check:
+                return None
+            last_check_ts = _parse_last_check(last_check).timestamp()
+            priority_data['last_check_ts'] = last_check_ts
+        return last_check_ts
+
+    def repos_by_priority(self) -> List[Tuple[str, Dict]]:
+        """Пары (репозиторий, данные приоритета), начиная с самого высокого priority_score
+
+        Порядок пересчитывается только после загрузки или пересчета приоритетов.
+        """
+        if self._sorted_repos is None:
+            self._sorted_repos = sorted(
+                ((repo, self.get_priority(repo)) for repo in REPOS),
+                key=lambda item: -item[1]['priority_score']
+            )
+        return self._sorted_repos
+
+    def next_check_due(self) -> Optional[float]:
+        """Ближайшее время (секунды эпохи), когда какой-либо репозиторий должен быть проверен"""
+        due_times = []
+        for repo_name in REPOS:
+            priority_data = self.get_priority(repo_name)
+            try:
+                last_check_ts = self.get_last_check_ts(priority_data)
+            except ValueError:
+                last_check_ts = None
+            if last_check_ts is None:
+                return time.time()
+            due_times.append(last_check_ts + priority_data['check_interval'] * 60)
+        return min(due_times, default=None)
 
     def should_update_priorities(self) -> bool:
         if not self.last_priority_update:
             return True
         return datetime.now(timezone.utc) - self.last_priority_update > timedelta(hours=6)
 
-    def update_priorities(self, history_manager):
+    async def update_priorities(self, history_manager):
+        """Пересчитывает приоритеты по истории релизов и сохраняет их в БД
+
+        Пересчет выполняется в цикле событий (как и все изменения priorities и _dirty),
+        в отдельный поток выносится только запись снимка в Supabase.
+        """
         logger.info("Обновление приоритетов репозиториев...")
 
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=PRIORITY_UPDATE_DAYS)
         updated_count = 0
 
-        for repo in REPOS:
-            update_count = 0
-            for rel in history_manager.history:
-                if rel['repo_name'] == repo:
-                    try:
-                        pub_date = datetime.fromisoformat(rel['published_at'].replace('Z', '+00:00'))
-                        if pub_date >= cutoff_date:
-                            update_count += 1
-                    except:
-                        continue
+        # Один проход по истории вместо отдельного прохода для каждого репозитория.
+        # Записи репозиториев, которых больше нет в REPOS, пропускаются без разбора даты
+        recent_updates = dict.fromkeys(REPOS, 0)
+        for rel in history_manager.history:
+            repo_name = rel.get('repo_name')
+            if repo_name not in recent_updates:
+                continue
+            try:
+                pub_date = _parse_published_at(rel['published_at'])
+            except:
+                continue
+            if pub_date >= cutoff_date:
+                recent_updates[repo_name] += 1
 
+        for repo in REPOS:
+            update_count = recent_updates[repo]
             priority_score = update_count / PRIORITY_UPDATE_DAYS
-            existing_data = self.priorities.get(repo, self._create_default_priority())
+            existing_data = self.priorities.get(repo)
+            if existing_data is None:
+                existing_data = self._create_default_priority()
 
             # Учитываем количество последовательных неудач
             failure_penalty = min(existing_data.get('consecutive_failures', 0) * 0.1, 0.5)
@@ -783,16 +1087,35 @@ class RepositoryPriorityManager:
 
             self.priorities[repo] = new_priority_data
 
+        self._sorted_repos = None
         self.last_priority_update = datetime.now(timezone.utc)
-        # Сохраняем в БД с обработкой ошибок
-        try:
-            self._save_priorities_to_db()
-        except RuntimeError as e:
-            if "SupabaseManager недоступен" in str(e):
-                logger.warning(f"Не удалось сохранить обновленные приоритеты в БД: {e}")
+
+        # Если пересчет ничего не изменил, повторно записывать те же данные не нужно
+        fingerprint = hash(tuple(
+            (repo, data['update_count'], data['check_interval'], data['priority_score'])
+            for repo, data in self.priorities.items()
+        ))
+        if fingerprint == self._last_fingerprint:
+            logger.info("Приоритеты не изменились, сохранение пропущено")
+            return
+
+        # Сохраняем в БД с обработкой ошибок (полная запись включает все отложенные изменения).
+        # При неудаче отложенные изменения возвращаются для flush(), а отпечаток
+        # не запоминается, чтобы следующий пересчет повторил запись
+        async with self._save_lock:
+            dirty, self._dirty = self._dirty, set()
+            snapshot = {repo: dict(data) for repo, data in self.priorities.items()}
+            try:
+                await asyncio.to_thread(self._save_priorities_to_db, snapshot)
+            except Exception as e:
+                self._dirty |= dirty
+                if "SupabaseManager недоступен" in str(e):
+                    logger.warning(f"Не удалось сохранить обновленные приоритеты в БД: {e}")
+                else:
+                    logger.error(f"Ошибка сохранения приоритетов в БД: {e}")
+                    raise
             else:
-                logger.error(f"Ошибка сохранения приоритетов в БД: {e}")
-                raise
+                self._last_fingerprint = fingerprint
 
         logger.info(f"Приоритеты обновлены. Изменено: {updated_count}/{len(REPOS)} репозиториев")
 
@@ -847,27 +1170,39 @@ class UserManager:
     def __init__(self):
         self.users_file = USERS_FILE
         self.users_data = self._load_users()
+        self._saver = DebouncedWriter(self._save_users)
+        # Пользователи, у которых ISO-строку last_activity нужно обновить при сохранении
+        self._touched: Set[int] = set()
+        # Суммарные счетчики для get_stats ведутся при изменениях, а не пересчитываются
+        self._total_commands = sum(data.get('commands_used', 0) for data in self.users_data.values())
+        self._total_notifications = sum(
+            data.get('notifications_received', 0) for data in self.users_data.values()
+        )
 
     def _load_users(self) -> Dict[int, Dict]:
         if os.path.exists(self.users_file):
             try:
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                    # Если старый формат (только список ID), конвертируем
-                    if isinstance(data, list):
-                        return {user_id: self._create_user_data() for user_id in data}
-                    elif isinstance(data, dict):
-                        # Дополняем недостающие поля
-                        for user_id, user_data in data.items():
-                            if not isinstance(user_data, dict):
-                                data[user_id] = self._create_user_data()
-                            else:
-                                default_data = self._create_user_data()
-                                for field, default_value in default_data.items():
-                                    if field not in user_data:
-                                        user_data[field] = default_value
-                        return {int(k): v for k, v in data.items()}
+                data = read_json_file(self.users_file)
+                
+                # Если старый формат (только список ID), конвертируем
+                if isinstance(data, list):
+                    return {user_id: self._create_user_data() for user_id in data}
+                elif isinstance(data, dict):
+                    # Дополняем недостающие поля
+                    for user_id, user_data in data.items():
+                        if not isinstance(user_data, dict):
+                            data[user_id] = self._create_user_data()
+                        else:
+                            default_data = self._create_user_data()
+                            for field, default_value in default_data.items():
+                                if field not in user_data:
+                                    user_data[field] = default_value
+                            # Файлы старого формата хранят только ISO-строку активности
+                            if user_data['last_activity_ts'] is None and user_data['last_activity']:
+                                user_data['last_activity_ts'] = self._parse_activity_ts(
+                                    user_data['last_activity']
+                                )
+                    return {int(k): v for k, v in data.items()}
                     
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Ошибка загрузки пользователей: {e}")
@@ -878,20 +1213,38 @@ class UserManager:
         return {
             'joined_at': datetime.now(timezone.utc).isoformat(),
             'last_activity': None,
+            'last_activity_ts': None,
             'notifications_received': 0,
             'commands_used': 0,
             'is_active': True
         }
 
-    def _save_users(self):
+    @staticmethod
+    def _parse_activity_ts(value: str) -> Optional[float]:
         try:
-            # Резервная копия
-            if os.path.exists(self.users_file):
-                backup_file = f"{self.users_file}.bak"
-                shutil.copy2(self.users_file, backup_file)
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            # Нераспознанная дата - пользователь считается активным
+            return None
+
+    def _touch(self, user_id: int):
+        """Обновляет время активности
 
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(self.users_data, f, ensure_ascii=False, indent=2)
+        Для сравнений используется число last_activity_ts, а ISO-строка
+        last_activity (для чтения человеком) форматируется только при сохранении.
+        """
+        self.users_data[user_id]['last_activity_ts'] = time.time()
+        self._touched.add(user_id)
+
+    def _save_users(self):
+        try:
+            for user_id in self._touched:
+                user_data = self.users_data.get(user_id)
+                if user_data is not None:
+                    user_data['last_activity'] = fmt_ts(user_data['last_activity_ts'])
+            self._touched.clear()
+            # Резервная копия .bak обновляется раз в час задачей snapshot_data_files
+            write_file_background(self.users_file, json_dumps(self.users_data))
         except IOError as e:
             logger.error(f"Ошибка сохранения пользователей: {e}")
 
@@ -900,62 +1253,51 @@ class UserManager:
             self.users_data[user_id] = self._create_user_data()
             if username:
                 self.users_data[user_id]['username'] = username
-            self._save_users()
+            self._saver.schedule()
             logger.info(f"Новый пользователь: {user_id} ({username})")
         else:
             # Обновляем активность
-            self.users_data[user_id]['last_activity'] = datetime.now(timezone.utc).isoformat()
+            self._touch(user_id)
             if username and 'username' not in self.users_data[user_id]:
                 self.users_data[user_id]['username'] = username
-                self._save_users()
+                self._saver.schedule()
 
     def record_activity(self, user_id: int, activity_type: str = 'command'):
         if user_id in self.users_data:
-            self.users_data[user_id]['last_activity'] = datetime.now(timezone.utc).isoformat()
+            self._touch(user_id)
             if activity_type == 'command':
                 self.users_data[user_id]['commands_used'] += 1
+                self._total_commands += 1
             elif activity_type == 'notification':
                 self.users_data[user_id]['notifications_received'] += 1
-            self._save_users()
+                self._total_notifications += 1
+            self._saver.schedule()
 
     def get_users(self) -> Set[int]:
         return set(self.users_data.keys())
 
     def get_active_users(self, days: int = 30) -> Set[int]:
         """Возвращает активных пользователей за последние N дней"""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-        active_users = set()
-        
-        for user_id, user_data in self.users_data.items():
-            if user_data.get('is_active', True):
-                last_activity = user_data.get('last_activity')
-                if last_activity:
-                    try:
-                        activity_date = datetime.fromisoformat(last_activity)
-                        if activity_date >= cutoff_date:
-                            active_users.add(user_id)
-                    except:
-                        # Если не можем распарсить дату, считаем пользователя активным
-                        active_users.add(user_id)
-                else:
-                    # Новые пользователи без активности считаются активными
-                    active_users.add(user_id)
+        cutoff_ts = time.time() - days * 86400
         
-        return active_users
+        # Новые пользователи без активности (и с нераспознанной датой) считаются активными
+        return {
+            user_id for user_id, user_data in self.users_data.items()
+            if user_data.get('is_active', True)
+            and (user_data.get('last_activity_ts') is None or user_data['last_activity_ts'] >= cutoff_ts)
+        }
 
     def get_count(self) -> int:
         return len(self.users_data)
 
     def get_stats(self) -> Dict:
         active_users = len(self.get_active_users(30))
-        total_commands = sum(data.get('commands_used', 0) for data in self.users_data.values())
-        total_notifications = sum(data.get('notifications_received', 0) for data in self.users_data.values())
         
         return {
             'total_users': len(self.users_data),
             'active_users_30d': active_users,
-            'total_commands': total_commands,
-            'total_notifications': total_notifications
+            'total_commands': self._total_commands,
+            'total_notifications': self._total_notifications
         }
 
 # --- ОСТАЛЬНЫЕ КЛАССЫ ОСТАЮТСЯ БЕЗ ИЗМЕНЕНИЙ, НО С УЛУЧШЕНИЯМИ ---
@@ -967,8 +1309,7 @@ class ReleaseStateManager:
     def _load_state(self) -> Dict[str, str]:
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json_file(self.state_file)
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Ошибка загрузки состояния: {e}")
                 self._backup_corrupted_file()
@@ -987,13 +1328,8 @@ class ReleaseStateManager:
 
     def _save_state(self):
         try:
-            # Резервная копия
-            if os.path.exists(self.state_file):
-                backup_file = f"{self.state_file}.bak"
-                shutil.copy2(self.state_file, backup_file)
-
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            # Резервная копия .bak обновляется раз в час задачей snapshot_data_files
+            write_file_background(self.state_file, json_dumps(self.state))
         except IOError as e:
             logger.error(f"Ошибка сохранения состояния: {e}")
 
@@ -1009,25 +1345,20 @@ class FilterManager:
     def __init__(self):
         self.filters_file = FILTERS_FILE
         self.filters = self._load_filters()
+        self._saver = DebouncedWriter(self._save_filters)
 
     def _load_filters(self) -> Dict[str, List[str]]:
         if os.path.exists(self.filters_file):
             try:
-                with open(self.filters_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json_file(self.filters_file)
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Ошибка загрузки фильтров: {e}")
         return {}
 
     def _save_filters(self):
         try:
-            # Резервная копия
-            if os.path.exists(self.filters_file):
-                backup_file = f"{self.filters_file}.bak"
-                shutil.copy2(self.filters_file, backup_file)
-
-            with open(self.filters_file, 'w', encoding='utf-8') as f:
-                json.dump(self.filters, f, ensure_ascii=False, indent=2)
+            # Резервная копия .bak обновляется раз в час задачей snapshot_data_files
+            write_file_background(self.filters_file, json_dumps(self.filters))
         except IOError as e:
             logger.error(f"Ошибка сохранения фильтров: {e}")
 
@@ -1036,7 +1367,7 @@ class FilterManager:
         normalized_keywords = [keyword.strip().lower() for keyword in keywords if keyword.strip()]
         if normalized_keywords:
             self.filters[user_id] = normalized_keywords
-            self._save_filters()
+            self._saver.schedule()
             logger.info(f"Установлены фильтры для пользователя {user_id}: {normalized_keywords}")
 
     def get_filters(self, user_id: str) -> List[str]:
@@ -1045,7 +1376,7 @@ class FilterManager:
     def clear_filters(self, user_id: str):
         if user_id in self.filters:
             del self.filters[user_id]
-            self._save_filters()
+            self._saver.schedule()
             logger.info(f"Очищены фильтры для пользователя {user_id}")
 
     def get_users_with_filters_count(self) -> int:
@@ -1067,14 +1398,49 @@ class ReleaseHistoryManager:
     def __init__(self):
         self.history_file = HISTORY_FILE
         self.history = self._load_history()
+        # Несколько релизов, найденных за одну проверку, записываются одним сохранением
+        self._saver = DebouncedWriter(self._save_history)
+        # Индексы: (repo_name, tag_name) для проверки дубликатов, дата публикации (UTC),
+        # число релизов по репозиториям и отсортированные времена публикации для get_stats
+        self._seen: Set[Tuple[str, Optional[str]]] = set()
+        self._by_date: Dict[date, List[Dict]] = {}
+        self._repo_counts: Counter = Counter()
+        self._pub_timestamps: List[float] = []
+        self._rebuild_index()
+
+    def _index_release(self, rel: Dict):
+        self._seen.add((rel['repo_name'], rel.get('tag_name')))
+        self._repo_counts[rel['repo_name']] += 1
+        try:
+            pub_dt = _parse_published_at(rel['published_at'])
+            pub_date = pub_dt.astimezone(timezone.utc).date()
+        except Exception as e:
+            logger.error(f"Ошибка при обработке даты релиза {rel['repo_name']} {rel.get('tag_name')}: {e}")
+            return
+        self._by_date.setdefault(pub_date, []).append(rel)
+        bisect.insort(self._pub_timestamps, pub_dt.timestamp())
+
+    def _rebuild_index(self):
+        self._seen.clear()
+        self._by_date.clear()
+        self._repo_counts.clear()
+        self._pub_timestamps.clear()
+        for rel in self.history:
+            self._index_release(rel)
 
     def _load_history(self) -> List[Dict]:
         if os.path.exists(self.history_file):
             try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                if ijson is not None and os.path.getsize(self.history_file) > HISTORY_STREAM_THRESHOLD_BYTES:
+                    # Записи разбираются по одной, без буфера парсера на весь файл
+                    with open(self.history_file, 'rb') as f:
+                        return list(ijson.items(f, 'item', use_float=True))
+                return read_json_file(self.history_file)
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Ошибка загрузки истории: {e}")
+            except Exception as e:
+                # Ошибки потокового парсера ijson
+                logger.error(f"Ошибка потоковой загрузки истории: {e}")
         return []
 
     def _save_history(self):
@@ -1083,33 +1449,25 @@ class ReleaseHistoryManager:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=HISTORY_DAYS)
             filtered_history = [
                 rel for rel in self.history
-                if datetime.fromisoformat(rel['published_at'].replace('Z', '+00:00')) >= cutoff_date
+                if _parse_published_at(rel['published_at']) >= cutoff_date
             ]
 
-            # Резервная копия
-            if os.path.exists(self.history_file):
-                backup_file = f"{self.history_file}.bak"
-                shutil.copy2(self.history_file, backup_file)
-
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(filtered_history, f, ensure_ascii=False, indent=2)
+            # Резервная копия .bak обновляется раз в час задачей snapshot_data_files
+            write_file_background(self.history_file, json_dumps(filtered_history))
             
             removed_count = len(self.history) - len(filtered_history)
             if removed_count > 0:
                 logger.info(f"Удалено {removed_count} старых записей из истории")
                 
             self.history = filtered_history
+            if removed_count > 0:
+                self._rebuild_index()
         except IOError as e:
             logger.error(f"Ошибка сохранения истории: {e}")
 
     def add_release(self, repo_name: str, release: Dict):
         # Проверяем, не существует ли уже такой релиз
-        exists = any(
-            rel['repo_name'] == repo_name and rel['tag_name'] == release.get('tag_name')
-            for rel in self.history
-        )
-
-        if not exists:
+        if (repo_name, release.get('tag_name')) not in self._seen:
             history_entry = {
                 'repo_name': repo_name,
                 'tag_name': release.get('tag_name'),
@@ -1120,7 +1478,8 @@ class ReleaseHistoryManager:
                 'added_to_history': datetime.now(timezone.utc).isoformat()
             }
             self.history.append(history_entry)
-            self._save_history()
+            self._index_release(history_entry)
+            self._saver.schedule()
             logger.info(f"Добавлен релиз в историю: {repo_name} {release.get('tag_name')}")
             return True
         return False
@@ -1128,39 +1487,20 @@ class ReleaseHistoryManager:
     def get_releases_by_date(self, target_date) -> List[Dict]:
         logger.info(f"Поиск релизов за дату: {target_date}")
 
-        result = []
-        for rel in self.history:
-            try:
-                pub_date_str = rel['published_at']
-                if pub_date_str.endswith('Z'):
-                    pub_date_str = pub_date_str[:-1] + '+00:00'
-
-                pub_date = datetime.fromisoformat(pub_date_str).astimezone(timezone.utc).date()
-                
-                if pub_date == target_date:
-                    result.append(rel)
-            except Exception as e:
-                logger.error(f"Ошибка при обработке даты релиза {rel['repo_name']} {rel['tag_name']}: {e}")
+        result = self._by_date.get(target_date, [])
 
         logger.info(f"Найдено {len(result)} релизов за дату {target_date}")
         return sorted(result, key=lambda x: x['published_at'], reverse=True)
 
     def get_recent_releases(self, days: int = 3) -> List[Dict]:
         cutoff_date = datetime.now(timezone.utc).date() - timedelta(days=days)
-        releases = []
         
-        for rel in self.history:
-            try:
-                pub_date_str = rel['published_at']
-                if pub_date_str.endswith('Z'):
-                    pub_date_str = pub_date_str[:-1] + '+00:00'
-                
-                pub_date = datetime.fromisoformat(pub_date_str).date()
-                if pub_date >= cutoff_date:
-                    releases.append(rel)
-            except Exception as e:
-                logger.error(f"Ошибка обработки даты релиза: {e}")
-                continue
+        # Даты публикации разобраны один раз при построении индекса _by_date
+        releases = [
+            rel
+            for pub_date, date_releases in self._by_date.items() if pub_date >= cutoff_date
+            for rel in date_releases
+        ]
         
         return sorted(releases, key=lambda x: x['published_at'], reverse=True)
 
@@ -1171,30 +1511,143 @@ class ReleaseHistoryManager:
         if not self.history:
             return {'total_releases': 0, 'releases_by_repo': {}, 'releases_last_7_days': 0}
         
-        releases_by_repo = {}
-        recent_releases = 0
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=7)
-        
-        for rel in self.history:
-            repo = rel['repo_name']
-            releases_by_repo[repo] = releases_by_repo.get(repo, 0) + 1
-            
-            try:
-                pub_date_str = rel['published_at']
-                if pub_date_str.endswith('Z'):
-                    pub_date_str = pub_date_str[:-1] + '+00:00'
-                pub_date = datetime.fromisoformat(pub_date_str)
-                if pub_date >= cutoff_date:
-                    recent_releases += 1
-            except:
-                pass
+        # Времена публикации отсортированы: релизы за 7 дней находятся бинарным поиском
+        cutoff_ts = time.time() - 7 * 86400
+        recent_releases = len(self._pub_timestamps) - bisect.bisect_left(self._pub_timestamps, cutoff_ts)
         
         return {
             'total_releases': len(self.history),
-            'releases_by_repo': releases_by_repo,
+            'releases_by_repo': dict(self._repo_counts),
             'releases_last_7_days': recent_releases
         }
 
+# --- КЭШ ОТВЕТОВ GITHUB API ---
+class ReleaseCache:
+    """Кэш последних ответов releases/latest (ETag, Last-Modified + данные) в SQLite
+
+    Каждая запись - отдельная строка таблицы, поэтому set/get затрагивают
+    только одну запись, а не переписывают весь файл. При переполнении
+    вытесняется наименее часто используемая запись (LFU), счетчики
+    обращений периодически уменьшаются вдвое методом decay().
+    """
+
+    def __init__(self, cache_file: str = RELEASE_CACHE_FILE,
+                 max_entries: int = RELEASE_CACHE_MAX_ENTRIES):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        try:
+            self.conn = self._connect(cache_file)
+        except sqlite3.Error as e:
+            logger.error(f"Не удалось открыть кэш {cache_file}, используется кэш в памяти: {e}")
+            self.conn = self._connect(":memory:")
+        # Ключи записей держим в памяти, чтобы не считать строки таблицы при каждой записи
+        self._keys: Set[str] = self._load_keys()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, ts REAL NOT NULL, etag TEXT, data BLOB, "
+            "hits INTEGER NOT NULL DEFAULT 0, last_modified TEXT)"
+        )
+        # Кэш, созданный до появления счетчика обращений и Last-Modified
+        for column in ("hits INTEGER NOT NULL DEFAULT 0", "last_modified TEXT"):
+            try:
+                conn.execute(f"ALTER TABLE cache ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass
+        return conn
+
+    def _load_keys(self) -> Set[str]:
+        try:
+            return {row[0] for row in self.conn.execute("SELECT key FROM cache")}
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка чтения ключей кэша: {e}")
+            return set()
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], bytes]]:
+        """Возвращает (etag, last_modified, данные в JSON) или None
+
+        Данные не разбираются: они нужны только при ответе 304.
+        """
+        try:
+            self.conn.execute("UPDATE cache SET hits = hits + 1 WHERE key = ?", (key,))
+            row = self.conn.execute(
+                "SELECT etag, last_modified, data FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and (row[0] or row[1]):
+                return row
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка чтения кэша для {key}: {e}")
+        return None
+
+    def set(self, key: str, etag: Optional[str], last_modified: Optional[str], data: Dict):
+        try:
+            # Счетчик обращений существующей записи сохраняется
+            self.conn.execute(
+                "INSERT INTO cache (key, ts, etag, last_modified, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "ts = excluded.ts, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, data = excluded.data",
+                (key, time.time(), etag, last_modified, json_dumps(data))
+            )
+            self._keys.add(key)
+            excess = len(self._keys) - self.max_entries
+            if excess > 0:
+                # Вытесняем наименее используемые записи (при равенстве - самые старые)
+                victims = [row[0] for row in self.conn.execute(
+                    "SELECT key FROM cache WHERE key != ? ORDER BY hits, ts LIMIT ?",
+                    (key, excess)
+                )]
+                self.conn.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k in victims])
+                self._keys.difference_update(victims)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка записи кэша для {key}: {e}")
+
+    def touch(self, key: str):
+        """Обновляет время записи (ответ 304 подтвердил актуальность данных)"""
+        try:
+            self.conn.execute("UPDATE cache SET ts = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка обновления кэша для {key}: {e}")
+
+    def delete(self, key: str):
+        """Удаляет запись (например, поврежденную)"""
+        try:
+            self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._keys.discard(key)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка удаления записи кэша для {key}: {e}")
+
+    def decay(self):
+        """Уменьшает счетчики обращений вдвое (старение LFU)"""
+        try:
+            self.conn.execute("UPDATE cache SET hits = hits >> 1 WHERE hits > 0")
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка старения кэша: {e}")
+
+    def cleanup(self, max_age_seconds: float) -> int:
+        """Удаляет записи, не подтверждавшиеся дольше max_age_seconds"""
+        try:
+            cursor = self.conn.execute(
+                "DELETE FROM cache WHERE ts < ?", (time.time() - max_age_seconds,)
+            )
+            if cursor.rowcount:
+                self._keys = self._load_keys()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка очистки кэша: {e}")
+            return 0
+
+    def close(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка закрытия кэша: {e}")
+
 # --- ИНИЦИАЛИЗАЦИЯ МЕНЕДЖЕРОВ ---
 statistics_manager = StatisticsManager()
 user_manager = UserManager()
@@ -1202,48 +1655,181 @@ state_manager = ReleaseStateManager()
 filter_manager = FilterManager()
 history_manager = ReleaseHistoryManager()
 priority_manager = RepositoryPriorityManager()
+release_cache = ReleaseCache()
+
+# --- ОБЩАЯ HTTP-СЕССИЯ ДЛЯ GITHUB API ---
+_github_session: Optional[ClientSession] = None
+
+async def get_github_session() -> ClientSession:
+    """Возвращает общую сессию для запросов к GitHub API, создавая ее при первом обращении
+
+    Все запросы идут на api.github.com, поэтому одна сессия позволяет
+    переиспользовать keep-alive соединения между проверками.
+    """
+    global _github_session
+    if _github_session is None or _github_session.closed:
+        connector = TCPConnector(
+            limit=CHECK_ALL_CONCURRENCY,
+            limit_per_host=CHECK_ALL_CONCURRENCY,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        _github_session = ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(total=GITHUB_REQUEST_TIMEOUT)
+        )
+    return _github_session
+
+async def close_github_session():
+    """Закрывает общую сессию GitHub API"""
+    global _github_session
+    if _github_session is not None and not _github_session.closed:
+        await _github_session.close()
+    _github_session = None
 
 # --- УЛУЧШЕННАЯ ЗАГРУЗКА ИНФОРМАЦИИ О РЕЛИЗАХ ---
-async def fetch_release(session: ClientSession, repo_name: str) -> Tuple[Optional[Dict], float]:
+# Заголовки запросов к GitHub API не меняются во время работы и собираются один раз
+_GH_HEADERS = {'User-Agent': 'GitHub-Release-Monitor-Bot'}
+if GITHUB_TOKEN:
+    _GH_HEADERS['Authorization'] = f'token {GITHUB_TOKEN}'
+
+# Остаток квоты GitHub API по заголовкам последнего ответа (общий для всех проверок)
+_gh_rate_remaining: Optional[int] = None
+_gh_rate_reset: float = 0.0
+
+def _update_rate_limit(headers):
+    """Запоминает X-RateLimit-Remaining / X-RateLimit-Reset из ответа GitHub"""
+    global _gh_rate_remaining, _gh_rate_reset
+    remaining = headers.get('X-RateLimit-Remaining')
+    if remaining is not None and remaining.isdigit():
+        _gh_rate_remaining = int(remaining)
+        reset = headers.get('X-RateLimit-Reset')
+        if reset is not None and reset.isdigit():
+            _gh_rate_reset = float(reset)
+
+def _rate_limit_wait() -> float:
+    """Сколько секунд ждать сброса квоты (0, если квота не исчерпана)"""
+    if _gh_rate_remaining == 0:
+        return max(0.0, _gh_rate_reset - time.time())
+    return 0.0
+
+# ETag последнего ответа хранится в release_cache: ответ 304 не содержит тела
+# и не расходует основной лимит GitHub API
+
+def _trim_release(data: Dict) -> Dict:
+    """Оставляет в ответе GitHub только поля, которые использует бот
+
+    Полный ответ releases/latest содержит данные автора, загрузчиков файлов и т.п.,
+    которые иначе хранились бы в кэше и истории.
+    """
+    return {
+        'tag_name': data.get('tag_name'),
+        'name': data.get('name'),
+        'html_url': data.get('html_url'),
+        'published_at': data.get('published_at'),
+        'body': (data.get('body') or '')[:RELEASE_BODY_MAX_LENGTH],
+        'assets': [
+            {'name': asset.get('name'), 'browser_download_url': asset.get('browser_download_url')}
+            for asset in data.get('assets') or []
+            if isinstance(asset, dict)
+        ]
+    }
+
+class FetchResult:
+    """Результат запроса последнего релиза
+
+    Attributes:
+        data: Данные релиза или None, если получить их не удалось
+        response_time: Время отклика в секундах (вместе с повторными попытками)
+        status: HTTP-статус последнего ответа или None, если ответа не было
+    """
+    __slots__ = ('data', 'response_time', 'status')
+
+    def __init__(self, data: Optional[Dict], response_time: float, status: Optional[int]):
+        self.data = data
+        self.response_time = response_time
+        self.status = status
+
+async def fetch_release(session: ClientSession, repo_name: str) -> FetchResult:
     """Загружает информацию о последнем релизе репозитория
     
     Returns:
-        Tuple[Optional[Dict], float]: (данные релиза, время отклика в секундах)
+        FetchResult: Данные релиза, время отклика в секундах и HTTP-статус
     """
     api_url = f"https://api.github.com/repos/{repo_name}/releases/latest"
-    headers = {'User-Agent': 'GitHub-Release-Monitor-Bot'}
-    
-    if GITHUB_TOKEN:
-        headers['Authorization'] = f'token {GITHUB_TOKEN}'
 
-    start_time = asyncio.get_event_loop().time()
+    # Условный запрос: при неизменившемся релизе GitHub отвечает 304 без тела
+    cached = release_cache.get(repo_name)
+    headers = _GH_HEADERS
+    if cached:
+        headers = dict(_GH_HEADERS)
+        if cached[0]:
+            headers['If-None-Match'] = cached[0]
+        if cached[1]:
+            headers['If-Modified-Since'] = cached[1]
+
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    status = None
     
     for attempt in range(MAX_RETRIES):
+        # Пауза перед следующей попыткой выполняется после выхода из async with,
+        # чтобы соединение не удерживалось в пуле во время ожидания
+        wait_time = RETRY_DELAY * (attempt + 1) if attempt < MAX_RETRIES - 1 else 0
+
+        # Если другой запрос уже исчерпал квоту, ждем ее сброса вместо
+        # заведомо отклоняемого запроса; при наличии квоты пауз нет
+        rate_wait = _rate_limit_wait()
+        if rate_wait:
+            logger.warning(f"Квота GitHub API исчерпана, {repo_name} ждет сброса {rate_wait:.0f} секунд")
+            await asyncio.sleep(rate_wait)
+
         try:
-            async with session.get(api_url, headers=headers, timeout=30) as response:
-                response_time = asyncio.get_event_loop().time() - start_time
+            async with session.get(api_url, headers=headers) as response:
+                response_time = loop.time() - start_time
+                status = response.status
+                _update_rate_limit(response.headers)
                 
                 if response.status == 200:
-                    data = await response.json()
+                    data = _trim_release(json_loads(await response.read()))
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    if etag or last_modified:
+                        release_cache.set(repo_name, etag, last_modified, data)
                     logger.debug(f"Успешно получены данные для {repo_name} за {response_time:.2f}с")
-                    return data, response_time
-                elif response.status == 403:
-                    # Rate limit
-                    reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                    current_time = int(datetime.now().timestamp())
-                    wait_time = max(reset_time - current_time, 60)
+                    return FetchResult(data, response_time, 200)
+                elif response.status == 304 and cached:
+                    try:
+                        data = json_loads(cached[2])
+                    except ValueError as e:
+                        # Запись удаляется, и следующая попытка идет без условных заголовков,
+                        # иначе GitHub снова ответит 304 на те же валидаторы
+                        logger.error(f"Поврежденная запись кэша для {repo_name}, повтор без кэша: {e}")
+                        release_cache.delete(repo_name)
+                        cached = None
+                        headers = _GH_HEADERS
+                        wait_time = 0
+                    else:
+                        release_cache.touch(repo_name)
+                        logger.debug(f"Данные для {repo_name} не изменились (304) за {response_time:.2f}с")
+                        return FetchResult(data, response_time, 304)
+                elif response.status in (403, 429):
+                    # Rate limit (вторичный лимит GitHub сообщает через Retry-After)
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        wait_time = int(retry_after)
+                    else:
+                        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+                        wait_time = max(reset_time - int(time.time()), 60)
                     logger.warning(f"Rate limit для {repo_name}. Ожидание {wait_time} секунд")
-                    await asyncio.sleep(wait_time)
-                    continue
                 elif response.status == 404:
                     logger.error(f"Репозиторий не найден: {repo_name}")
-                    return None, response_time
+                    return FetchResult(None, response_time, 404)
                 else:
                     logger.error(f"Неожиданный статус {response.status} для {repo_name}")
-                    if attempt < MAX_RETRIES - 1:
-                        await asyncio.sleep(RETRY_DELAY * (attempt + 1))
-                        continue
-                    return None, response_time
+                    if attempt >= MAX_RETRIES - 1:
+                        return FetchResult(None, response_time, response.status)
                     
         except asyncio.TimeoutError:
             logger.error(f"Timeout при запросе к {repo_name} (попытка {attempt + 1})")
@@ -1252,19 +1838,14 @@ async def fetch_release(session: ClientSession, repo_name: str) -> Tuple[Optiona
         except Exception as e:
             logger.error(f"Неожиданная ошибка при запросе к {repo_name}: {e}")
             
-        if attempt < MAX_RETRIES - 1:
-            await asyncio.sleep(RETRY_DELAY * (attempt + 1))
+        if wait_time:
+            await asyncio.sleep(wait_time)
     
-    response_time = asyncio.get_event_loop().time() - start_time
-    return None, response_time
+    return FetchResult(None, loop.time() - start_time, status)
 
 # --- УЛУЧШЕННАЯ ПРОВЕРКА СООТВЕТСТВИЯ ФИЛЬТРАМ ---
-def matches_filters(release_data: dict, keywords: List[str]) -> bool:
-    """Проверяет соответствие релиза фильтрам пользователя"""
-    if not keywords:
-        return True
-
-    # Создаем текст для поиска
+def release_search_text(release_data: dict) -> str:
+    """Текст релиза (название, тег, описание, имена файлов) в нижнем регистре для поиска ключевых слов"""
     search_fields = [
         release_data.get('name', ''),
         release_data.get('tag_name', ''),
@@ -1276,10 +1857,15 @@ def matches_filters(release_data: dict, keywords: List[str]) -> bool:
         if isinstance(asset, dict):
             search_fields.append(asset.get('name', ''))
 
-    search_text = " ".join(search_fields).lower()
+    return " ".join(search_fields).lower()
 
-    # Проверяем наличие всех ключевых слов
-    return all(keyword.lower() in search_text for keyword in keywords)
+def matches_filters(present_keywords: Set[str], keywords: List[str]) -> bool:
+    """Проверяет соответствие релиза фильтрам пользователя
+
+    present_keywords - ключевые слова в нижнем регистре, найденные в release_search_text() релиза
+    """
+    # Проверяем наличие всех ключевых слов (пустой фильтр пропускает любой релиз)
+    return all(keyword.lower() in present_keywords for keyword in keywords)
 
 def format_release_message(repo_name: str, release: Dict) -> str:
     """Форматирует сообщение о релизе с улучшенной очисткой от Markdown"""
@@ -1303,7 +1889,7 @@ def format_release_message(repo_name: str, release: Dict) -> str:
     # Добавляем дату публикации в МСК
     if published_at:
         try:
-            pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+            pub_date = _parse_published_at(published_at)
             # Преобразуем в МСК (UTC+3)
             msk_time = pub_date + timedelta(hours=3)
             formatted_date = msk_time.strftime('%Y-%m-%d %H:%M МСК')
@@ -1349,6 +1935,56 @@ def format_release_message(repo_name: str, release: Dict) -> str:
     
     return message
 
+# Кэш отформатированных сообщений о релизах: (repo, tag, published_at) -> текст
+_release_message_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+RELEASE_MESSAGE_CACHE_SIZE = 512
+
+def format_release_message_cached(repo_name: str, release: Dict) -> str:
+    """Возвращает format_release_message из LRU-кэша (релизы не меняются после публикации)"""
+    key = (repo_name, release.get('tag_name'), release.get('published_at'))
+
+    cached = _release_message_cache.get(key)
+    if cached is not None:
+        _release_message_cache.move_to_end(key)
+        return cached
+
+    message = format_release_message(repo_name, release)
+    _release_message_cache[key] = message
+    if len(_release_message_cache) > RELEASE_MESSAGE_CACHE_SIZE:
+        _release_message_cache.popitem(last=False)
+    return message
+
+def pack_messages(messages: List[str], max_length: int = 3800, separator: str = "\n\n") -> List[str]:
+    """Объединяет сообщения в блоки, не превышающие max_length символов
+
+    Args:
+        messages: Список готовых сообщений
+        max_length: Максимальная длина блока (с запасом до лимита Telegram 4096)
+        separator: Разделитель между сообщениями внутри блока
+
+    Returns:
+        List[str]: Блоки для отправки
+    """
+    chunks = []
+    buffer = []
+    size = 0
+
+    for msg in messages:
+        if buffer and size + len(separator) + len(msg) > max_length:
+            chunks.append(separator.join(buffer))
+            buffer = []
+            size = 0
+
+        if buffer:
+            size += len(separator)
+        buffer.append(msg)
+        size += len(msg)
+
+    if buffer:
+        chunks.append(separator.join(buffer))
+
+    return chunks
+
 async def send_notifications(bot: Bot, repo_name: str, release: Dict) -> int:
     """Отправляет уведомления о новом релизе
     
@@ -1368,6 +2004,12 @@ async def send_notifications(bot: Bot, repo_name: str, release: Dict) -> int:
                 f"с фильтрами {len(users_with_filters)}, "
                 f"без фильтров {len(users_without_filters)}")
 
+    # Текст релиза собирается один раз, и каждое ключевое слово ищется в нем один раз,
+    # сколько бы пользователей его ни использовали
+    search_text = release_search_text(release)
+    all_keywords = {keyword.lower() for keywords in filter_manager.filters.values() for keyword in keywords}
+    present_keywords = {keyword for keyword in all_keywords if keyword in search_text}
+
     # 1. Отправляем пользователям с фильтрами (если релиз подходит под фильтры)
     for user_id_str, filters in filter_manager.filters.items():
         try:
@@ -1377,9 +2019,9 @@ async def send_notifications(bot: Bot, repo_name: str, release: Dict) -> int:
             if user_id not in all_users:
                 continue
                 
-            if matches_filters(release, filters):
+            if matches_filters(present_keywords, filters):
                 try:
-                    await bot.send_message(user_id, message, parse_mode="Markdown")
+                    await bot.send_message(user_id, message, parse_mode=_MD)
                     notifications_sent += 1
                     user_manager.record_activity(user_id, 'notification')
                     logger.info(f"✅ Уведомление отправлено пользователю {user_id} (фильтры)")
@@ -1393,7 +2035,7 @@ async def send_notifications(bot: Bot, repo_name: str, release: Dict) -> int:
     # 2. Отправляем пользователям БЕЗ фильтров (они получают ВСЕ релизы)
     for user_id in users_without_filters:
         try:
-            await bot.send_message(user_id, message, parse_mode="Markdown")
+            await bot.send_message(user_id, message, parse_mode=_MD)
             notifications_sent += 1
             user_manager.record_activity(user_id, 'notification')
             logger.info(f"✅ Уведомление отправлено пользователю {user_id} (без фильтров)")
@@ -1403,7 +2045,7 @@ async def send_notifications(bot: Bot, repo_name: str, release: Dict) -> int:
     # 3. Отправляем в канал (если указан)
     if CHANNEL_ID:
         try:
-            await bot.send_message(CHANNEL_ID, message, parse_mode="Markdown")
+            await bot.send_message(CHANNEL_ID, message, parse_mode=_MD)
             logger.info(f"✅ Уведомление отправлено в канал {CHANNEL_ID}")
             notifications_sent += 1
         except Exception as e:
@@ -1411,8 +2053,7 @@ async def send_notifications(bot: Bot, repo_name: str, release: Dict) -> int:
 
     # Обновляем статистику
     if notifications_sent > 0:
-        statistics_manager.increment_notifications()
-        statistics_manager.increment_releases(repo_name)
+        statistics_manager.record_release_notified(repo_name)
 
     logger.info(f"Отправлено {notifications_sent} уведомлений для {repo_name}")
     return notifications_sent
@@ -1430,45 +2071,46 @@ async def check_single_repo(bot: Bot, repo_name: str) -> bool:
         # Обновляем статистику проверок
         statistics_manager.increment_checks(repo_name)
         
-        async with ClientSession() as session:
-            release, response_time = await fetch_release(session, repo_name)
-            
-            # Записываем информацию о проверке
-            success = release is not None
-            priority_manager.record_check(repo_name, success, response_time)
+        session = await get_github_session()
+        result = await fetch_release(session, repo_name)
+        release = result.data
 
-            if not release:
-                logger.warning(f"❌ Не получены данные о релизах для {repo_name}")
-                return False
+        # Записываем информацию о проверке
+        priority_manager.record_check(repo_name, release is not None, result.response_time)
 
-            current_tag = release.get('tag_name')
-            if not current_tag:
-                logger.warning(f"❌ Не найден тег в данных релиза для {repo_name}")
-                return False
+        if not release:
+            logger.warning(f"❌ Не получены данные о релизах для {repo_name} (статус: {result.status})")
+            return False
 
-            last_tag = state_manager.get_last_tag(repo_name)
-            
-            if last_tag != current_tag:
-                logger.info(f"🆕 Найден новый релиз {repo_name}: {current_tag} (предыдущий: {last_tag})")
+        current_tag = release.get('tag_name')
+        if not current_tag:
+            logger.warning(f"❌ Не найден тег в данных релиза для {repo_name}")
+            return False
 
-                # Добавляем в историю
-                history_manager.add_release(repo_name, release)
-                
-                # Обновляем приоритет
-                priority_manager.record_update(repo_name)
-                
-                # Отправляем уведомления
-                notifications_sent = await send_notifications(bot, repo_name, release)
-                
-                # Обновляем состояние
-                state_manager.update_tag(repo_name, current_tag)
+        last_tag = state_manager.get_last_tag(repo_name)
 
-                logger.info(f"✅ Успешно обработан новый релиз для {repo_name}. "
-                           f"Отправлено уведомлений: {notifications_sent}")
-                return True
-            else:
-                logger.debug(f"ℹ️ Обновлений для {repo_name} не найдено")
-                return False
+        if last_tag != current_tag:
+            logger.info(f"🆕 Найден новый релиз {repo_name}: {current_tag} (предыдущий: {last_tag})")
+
+            # Добавляем в историю
+            if history_manager.add_release(repo_name, release):
+                _release_message_cache.clear()
+
+            # Обновляем приоритет
+            priority_manager.record_update(repo_name)
+
+            # Отправляем уведомления
+            notifications_sent = await send_notifications(bot, repo_name, release)
+
+            # Обновляем состояние
+            state_manager.update_tag(repo_name, current_tag)
+
+            logger.info(f"✅ Успешно обработан новый релиз для {repo_name}. "
+                       f"Отправлено уведомлений: {notifications_sent}")
+            return True
+        else:
+            logger.debug(f"ℹ️ Обновлений для {repo_name} не найдено")
+            return False
 
     except Exception as e:
         logger.error(f"❌ Критическая ошибка при проверке репозитория {repo_name}: {str(e)}")
@@ -1484,128 +2126,214 @@ async def check_single_repo(bot: Bot, repo_name: str) -> bool:
                     f"⚠️ *Критическая ошибка при проверке репозитория*\n\n"
                     f"📦 Репозиторий: `{repo_name}`\n"
                     f"❌ Ошибка: `{str(e)[:500]}`\n"
-                    f"🕒 Время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    f"🕒 Время: {now_str()}"
                 )
-                await bot.send_message(ADMIN_ID, error_message, parse_mode="Markdown")
+                await bot.send_message(ADMIN_ID, error_message, parse_mode=_MD)
             except:
                 pass  # Игнорируем ошибки отправки уведомлений админу
         
         return False
 
 # --- УЛУЧШЕННАЯ ПРОВЕРКА РЕПОЗИТОРИЕВ С УЧЕТОМ ПРИОРИТЕТОВ ---
-async def check_repositories(bot: Bot):
+@functools.lru_cache(maxsize=256)
+def _parse_last_check(value: str) -> datetime:
+    """Разбирает ISO-время последней проверки (одна и та же строка разбирается один раз)"""
+    return datetime.fromisoformat(value)
+
+def schedule_next_check(scheduler: AsyncIOScheduler):
+    """Переносит следующий запуск repositories_check на ближайший срок проверки
+
+    Вместо опроса каждые MIN_CHECK_INTERVAL_MINUTES задача просыпается, когда
+    какой-либо репозиторий действительно должен быть проверен (но не реже
+    MAX_CHECK_SLEEP_MINUTES, чтобы учесть пересчет приоритетов).
+    """
+    now_ts = time.time()
+    next_ts = priority_manager.next_check_due() or now_ts
+    # Не чаще раза в 5 минут: репозиторий, проверка которого упала с исключением,
+    # остается просроченным и иначе опрашивался бы непрерывно
+    next_ts = min(max(next_ts, now_ts + 300), now_ts + MAX_CHECK_SLEEP_MINUTES * 60)
+    try:
+        scheduler.modify_job(
+            'repositories_check',
+            next_run_time=datetime.fromtimestamp(next_ts, timezone.utc)
+        )
+        logger.debug(f"⏰ Следующая проверка репозиториев через {(next_ts - now_ts) / 60:.0f} мин")
+    except Exception as e:
+        logger.error(f"Не удалось перенести следующую проверку репозиториев: {e}")
+
+async def check_repositories(bot: Bot, scheduler: Optional[AsyncIOScheduler] = None):
     """Проверяет репозитории согласно их приоритетам"""
     logger.info("🔄 Запуск автоматической проверки репозиториев с учетом приоритетов...")
 
     # Обновляем приоритеты если нужно
     if priority_manager.should_update_priorities():
         logger.info("📊 Обновление приоритетов репозиториев...")
-        priority_manager.update_priorities(history_manager)
+        await priority_manager.update_priorities(history_manager)
 
     current_time = datetime.now(timezone.utc)
+    checked_at = current_time.isoformat()
+    last_checks = {}
     repos_to_check = []
     repos_checked = 0
     repos_with_updates = 0
 
     # Определяем какие репозитории нужно проверить
-    for repo_name in REPOS:
-        priority_data = priority_manager.get_priority(repo_name)
-        check_interval = priority_data['check_interval']
-        last_check = priority_data.get('last_check')
+    # Репозитории с высоким приоритетом проверяются первыми
+    now_ts = current_time.timestamp()
+    for repo_name, priority_data in priority_manager.repos_by_priority():
+        check_interval_s = priority_data['check_interval'] * 60
 
         should_check = False
-        if not last_check:
-            should_check = True
-            logger.debug(f"📦 {repo_name}: первая проверка")
-        else:
-            try:
-                last_check_time = datetime.fromisoformat(last_check)
-                time_since_check = current_time - last_check_time
-                
-                if time_since_check >= timedelta(minutes=check_interval):
-                    should_check = True
-                    logger.debug(f"📦 {repo_name}: прошло {time_since_check}, интервал {check_interval} мин")
-                else:
-                    remaining = timedelta(minutes=check_interval) - time_since_check
-                    logger.debug(f"📦 {repo_name}: ещё {remaining} до следующей проверки")
-            except Exception as e:
-                logger.error(f"Ошибка парсинга времени последней проверки для {repo_name}: {e}")
+        try:
+            last_check_ts = priority_manager.get_last_check_ts(priority_data)
+            if last_check_ts is None:
+                should_check = True
+                logger.debug(f"📦 {repo_name}: первая проверка")
+            elif now_ts - last_check_ts >= check_interval_s:
                 should_check = True
+                logger.debug(f"📦 {repo_name}: прошло {(now_ts - last_check_ts) / 60:.0f} мин, "
+                             f"интервал {priority_data['check_interval']} мин")
+            else:
+                logger.debug(f"📦 {repo_name}: ещё {(check_interval_s - now_ts + last_check_ts) / 60:.0f} мин "
+                             f"до следующей проверки")
+        except Exception as e:
+            logger.error(f"Ошибка парсинга времени последней проверки для {repo_name}: {e}")
+            should_check = True
 
         if should_check:
             repos_to_check.append(repo_name)
 
     logger.info(f"📋 Будет проверено {len(repos_to_check)} из {len(REPOS)} репозиториев")
 
-    # Проверяем репозитории
-    for repo_name in repos_to_check:
-        try:
-            has_update = await check_single_repo(bot, repo_name)
-            repos_checked += 1
-            
-            if has_update:
-                repos_with_updates += 1
+    # Проверяем репозитории параллельно: число одновременных запросов
+    # ограничено пулом соединений общей сессии GitHub (CHECK_ALL_CONCURRENCY)
+    results = await asyncio.gather(
+        *(check_single_repo(bot, repo_name) for repo_name in repos_to_check),
+        return_exceptions=True
+    )
 
-            # Обновляем время последней проверки
-            priority_data = priority_manager.get_priority(repo_name)
-            priority_data['last_check'] = current_time.isoformat()
-            priority_manager._save_priorities()
+    for repo_name, result in zip(repos_to_check, results):
+        if isinstance(result, Exception):
+            logger.error(f"Ошибка при проверке {repo_name}: {result}")
+            continue
 
-            # Небольшая пауза между проверками
-            await asyncio.sleep(1)
+        repos_checked += 1
+        if result:
+            repos_with_updates += 1
 
-        except Exception as e:
-            logger.error(f"Ошибка при проверке {repo_name}: {e}")
-            continue
+        # Время последней проверки записываем одним пакетом после цикла
+        last_checks[repo_name] = checked_at
+
+    # Одна запись приоритетов в БД на весь цикл проверки
+    priority_manager.record_last_check_bulk(last_checks)
+    try:
+        await priority_manager.flush()
+    except Exception as e:
+        logger.error(f"Ошибка сохранения приоритетов: {e}")
 
     logger.info(f"✅ Проверка завершена: проверено {repos_checked}, "
                 f"найдено обновлений {repos_with_updates}")
 
+    if scheduler is not None:
+        schedule_next_check(scheduler)
+
 # --- ПРИНУДИТЕЛЬНАЯ ПРОВЕРКА ВСЕХ РЕПОЗИТОРИЕВ ---
-async def check_all_repositories(bot: Bot):
-    """Принудительно проверяет все репозитории"""
+async def check_all_repositories(bot: Bot) -> Dict:
+    """Принудительно проверяет все репозитории
+
+    Репозитории проверяются параллельно; число одновременных запросов к GitHub
+    ограничено пулом соединений общей сессии (CHECK_ALL_CONCURRENCY), поэтому
+    паузы между повторными попытками не занимают слот.
+
+    Returns:
+        Dict: Количество проверенных репозиториев, найденных обновлений и длительность
+    """
     logger.info("🔄 Запуск принудительной проверки всех репозиториев...")
 
     repos_checked = 0
     repos_with_updates = 0
-    current_time = datetime.now(timezone.utc)
+    checked_at = datetime.now(timezone.utc).isoformat()
+    last_checks = {}
+    start_time = time.monotonic()
+
+    async def check_one(repo_name: str):
+        nonlocal repos_checked, repos_with_updates
 
-    for repo_name in REPOS:
         try:
             logger.info(f"🔍 Принудительная проверка {repo_name}...")
             has_update = await check_single_repo(bot, repo_name)
             repos_checked += 1
-            
+
             if has_update:
                 repos_with_updates += 1
 
-            # Обновляем время последней проверки
-            priority_data = priority_manager.get_priority(repo_name)
-            priority_data['last_check'] = current_time.isoformat()
-            priority_manager._save_priorities()
-
-            # Пауза между проверками
-            await asyncio.sleep(2)
+            # Время последней проверки записываем одним пакетом после цикла
+            last_checks[repo_name] = checked_at
 
         except Exception as e:
             logger.error(f"Ошибка при принудительной проверке {repo_name}: {e}")
-            continue
 
-    logger.info(f"✅ Принудительная проверка завершена: проверено {repos_checked}, "
+    await asyncio.gather(*(check_one(repo_name) for repo_name in REPOS))
+
+    # Одна запись приоритетов в БД на весь цикл проверки
+    priority_manager.record_last_check_bulk(last_checks)
+    try:
+        await priority_manager.flush()
+    except Exception as e:
+        logger.error(f"Ошибка сохранения приоритетов: {e}")
+
+    duration = time.monotonic() - start_time
+    logger.info(f"✅ Принудительная проверка завершена за {duration:.1f}с: проверено {repos_checked}, "
                 f"найдено обновлений {repos_with_updates}")
 
+    return {
+        'repos_checked': repos_checked,
+        'repos_with_updates': repos_with_updates,
+        'duration': duration
+    }
+
 # --- ОБРАБОТЧИКИ КОМАНД ---
 
+def track_user(activity_type: Optional[str] = 'command'):
+    """Декоратор обработчика: регистрирует пользователя и его активность
+
+    Args:
+        activity_type: Тип активности для record_activity (None — только регистрация)
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(event, *args, **kwargs):
+            user = event.from_user
+            user_manager.add_user(user.id, user.username)
+            if activity_type:
+                user_manager.record_activity(user.id, activity_type)
+            return await handler(event, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def _build_filter_keyboard():
+    """Клавиатура с кнопкой отмены настройки фильтров"""
+    keyboard = InlineKeyboardBuilder()
+    keyboard.button(text="❌ Отмена", callback_data="cancel_filter")
+    return keyboard.as_markup()
+
+def _build_donate_keyboard():
+    """Клавиатура с кнопкой перехода на страницу доната"""
+    keyboard = InlineKeyboardBuilder()
+    keyboard.button(text="💝 Поддержать разработчика", url=DONATE_URL)
+    return keyboard.as_markup()
+
+# Клавиатуры неизменяемы, поэтому создаются один раз при загрузке модуля
+_FILTER_KB = _build_filter_keyboard()
+_DONATE_KB = _build_donate_keyboard()
+
 async def start_command(message: Message):
     """Обработчик команды /start"""
     username = message.from_user.username
-    user_manager.add_user(message.from_user.id, username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     logger.info(f"👤 Команда /start от пользователя {message.from_user.id} (@{username})")
 
     # Создаем приветственное сообщение в зависимости от роли пользователя
-    if message.from_user.id == ADMIN_ID:
+    if message.from_user.id in _ADMINS:
         welcome_message = (
             "👋 *Добро пожаловать, Администратор!*\n\n"
             "🤖 Это бот для мониторинга релизов GitHub репозиториев с майнерами.\n\n"
@@ -1643,19 +2371,18 @@ async def start_command(message: Message):
             "Используйте фильтры, чтобы получать только интересующие вас обновления."
         )
 
-    await message.answer(welcome_message, parse_mode="Markdown")
+    await message.answer(welcome_message, parse_mode=_MD)
 
     # Показываем последние релизы
     recent_releases = history_manager.get_recent_releases(3)
     if recent_releases:
-        await message.answer("📅 *Последние релизы за 3 дня:*", parse_mode="Markdown")
+        await message.answer("📅 *Последние релизы за 3 дня:*", parse_mode=_MD)
         
         # Ограничиваем количество показываемых релизов
-        for rel in recent_releases[:5]:  # Максимум 5 релизов
+        for rel in itertools.islice(recent_releases, 5):  # Максимум 5 релизов
             try:
-                msg = format_release_message(rel['repo_name'], rel)
-                await message.answer(msg, parse_mode="Markdown")
-                await asyncio.sleep(0.5)  # Небольшая пауза между сообщениями
+                msg = format_release_message_cached(rel['repo_name'], rel)
+                await message.answer(msg, parse_mode=_MD)
             except Exception as e:
                 logger.error(f"Ошибка отправки релиза в /start: {e}")
                 continue
@@ -1664,15 +2391,8 @@ async def start_command(message: Message):
 
 async def filter_command(message: Message):
     """Обработчик команды /filter"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     logger.info(f"🔍 Пользователь {message.from_user.id} настраивает фильтры")
 
-    # Создаем клавиатуру с кнопкой отмены
-    keyboard = InlineKeyboardBuilder()
-    keyboard.button(text="❌ Отмена", callback_data="cancel_filter")
-
     current_filters = filter_manager.get_filters(str(message.from_user.id))
     current_filters_text = ""
     
@@ -1692,29 +2412,24 @@ async def filter_command(message: Message):
         f"• Описании релиза\n"
         f"• Именах файлов{current_filters_text}\n\n"
         f"⏳ Ожидаю ввод ключевых слов...",
-        reply_markup=keyboard.as_markup(),
-        parse_mode="Markdown"
+        reply_markup=_FILTER_KB,
+        parse_mode=_MD
     )
 
 async def cancel_filter_callback(callback: CallbackQuery):
     """Обработчик отмены настройки фильтров"""
-    user_manager.add_user(callback.from_user.id, callback.from_user.username)
-    
     logger.info(f"❌ Пользователь {callback.from_user.id} отменил настройку фильтров")
 
     await callback.message.edit_text(
         "❌ *Настройка фильтров отменена*\n\n"
         "Используйте /filter для повторной настройки фильтров.",
         reply_markup=None,
-        parse_mode="Markdown"
+        parse_mode=_MD
     )
     await callback.answer("Настройка фильтров отменена")
 
 async def process_filter_text(message: Message):
     """Обработчик текста для установки фильтров"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     user_id = str(message.from_user.id)
     text = message.text.strip()
 
@@ -1731,7 +2446,7 @@ async def process_filter_text(message: Message):
         await message.answer(
             "❌ *Ошибка:* Вы не ввели ключевые слова.\n\n"
             "Пожалуйста, введите хотя бы одно ключевое слово или используйте /filter для повторной настройки.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
         return
 
@@ -1740,7 +2455,7 @@ async def process_filter_text(message: Message):
         await message.answer(
             "❌ *Ошибка:* Слишком много ключевых слов.\n\n"
             "Максимальное количество: 10. Пожалуйста, сократите список.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
         return
 
@@ -1756,14 +2471,11 @@ async def process_filter_text(message: Message):
         f"содержащих эти слова.\n\n"
         f"💡 *Совет:* Используйте /myfilters для просмотра текущих фильтров "
         f"или /clearfilters для их удаления.",
-        parse_mode="Markdown"
+        parse_mode=_MD
     )
 
 async def myfilters_command(message: Message):
     """Обработчик команды /myfilters"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     user_id = str(message.from_user.id)
     filters = filter_manager.get_filters(user_id)
 
@@ -1775,7 +2487,7 @@ async def myfilters_command(message: Message):
             "Это означает, что вы получаете уведомления о ВСЕХ новых релизах.\n\n"
             "💡 Используйте /filter для настройки фильтров, если хотите получать "
             "только определенные релизы.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
     else:
         keywords_text = ", ".join(f"`{kw}`" for kw in filters)
@@ -1787,14 +2499,11 @@ async def myfilters_command(message: Message):
             f"💡 *Управление фильтрами:*\n"
             f"• /filter — изменить фильтры\n"
             f"• /clearfilters — удалить все фильтры",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
 
 async def clearfilters_command(message: Message):
     """Обработчик команды /clearfilters"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     user_id = str(message.from_user.id)
 
     logger.info(f"🗑️ Пользователь {user_id} очищает фильтры")
@@ -1810,21 +2519,18 @@ async def clearfilters_command(message: Message):
             f"❌ *Удаленные фильтры:* {keywords_text}\n\n"
             f"ℹ️ Теперь вы будете получать уведомления о ВСЕХ новых релизах.\n\n"
             f"💡 Используйте /filter для повторной настройки фильтров.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
     else:
         await message.answer(
             "📭 *У вас и так нет установленных фильтров*\n\n"
             "Вы уже получаете уведомления о всех релизах.\n\n"
             "💡 Используйте /filter для настройки фильтров.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
 
 async def last_command(message: Message):
     """Обработчик команды /last"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     logger.info(f"📅 Пользователь {message.from_user.id} запрашивает последние релизы")
 
     recent_releases = history_manager.get_recent_releases(3)
@@ -1834,37 +2540,35 @@ async def last_command(message: Message):
             "📭 *За последние 3 дня релизов не было*\n\n"
             "Бот продолжает мониторинг репозиториев. "
             "Как только появятся новые релизы, вы получите уведомление!",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
     else:
         await message.answer(
             f"📅 *Найдено {len(recent_releases)} релизов за последние 3 дня:*",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
         
         # Ограничиваем количество показываемых релизов
-        for i, rel in enumerate(recent_releases[:10], 1):  # Максимум 10 релизов
+        release_messages = []
+        for rel in itertools.islice(recent_releases, 10):  # Максимум 10 релизов
             try:
-                msg = format_release_message(rel['repo_name'], rel)
-                await message.answer(msg, parse_mode="Markdown")
-                
-                # Добавляем паузу после каждых 3 сообщений
-                if i % 3 == 0 and i < len(recent_releases):
-                    await asyncio.sleep(1)
-                    
+                release_messages.append(format_release_message_cached(rel['repo_name'], rel))
             except Exception as e:
-                logger.error(f"Ошибка отправки релиза в /last: {e}")
-                continue
+                logger.error(f"Ошибка форматирования релиза в /last: {e}")
+
+        # Объединяем релизы в минимальное количество сообщений
+        for chunk in pack_messages(release_messages):
+            try:
+                await message.answer(chunk, parse_mode=_MD)
+            except Exception as e:
+                logger.error(f"Ошибка отправки релизов в /last: {e}")
 
 async def help_command(message: Message):
     """Обработчик команды /help"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     logger.info(f"❓ Пользователь {message.from_user.id} запрашивает справку")
 
     # Создаем разную справку для админа и обычных пользователей
-    if message.from_user.id == ADMIN_ID:
+    if message.from_user.id in _ADMINS:
         help_text = (
             "📚 *Справка по использованию бота (Администратор)*\n\n"
             
@@ -1938,18 +2642,12 @@ async def help_command(message: Message):
             "  *A:* Автоматически, в зависимости от активности репозитория"
         )
 
-    await message.answer(help_text, parse_mode="Markdown")
+    await message.answer(help_text, parse_mode=_MD, link_preview_options=_NOPREV)
 
 async def donate_command(message: Message):
     """Обработчик команды /donate"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-    
     logger.info(f"💝 Пользователь {message.from_user.id} запросил информацию о донате")
 
-    keyboard = InlineKeyboardBuilder()
-    keyboard.button(text="💝 Поддержать разработчика", url=DONATE_URL)
-
     await message.answer(
         "💖 *Поддержка проекта*\n\n"
         "Спасибо за интерес к поддержке моего бота! "
@@ -1969,32 +2667,38 @@ async def donate_command(message: Message):
         
         "🙏 Любая сумма будет принята с благодарностью!\n\n"
         "Нажмите кнопку ниже для перехода на страницу доната:",
-        reply_markup=keyboard.as_markup(),
-        parse_mode="Markdown"
+        reply_markup=_DONATE_KB,
+        parse_mode=_MD,
+        link_preview_options=_NOPREV
     )
 
 # --- АДМИНИСТРАТИВНЫЕ КОМАНДЫ ---
 
-async def stats_command(message: Message):
-    """Обработчик команды /stats"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
+# --- КЭШ ТЕКСТА /stats ---
+STATS_REPORT_TTL_SECONDS = 30
+_stats_report_cache: Optional[Tuple[float, str]] = None
 
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
-        return
+def get_stats_report() -> str:
+    """Текст /stats без строки текущего времени
 
-    logger.info(f"📊 Администратор запрашивает статистику")
+    Сборка обходит статистику всех менеджеров, поэтому готовый текст
+    переиспользуется в течение STATS_REPORT_TTL_SECONDS.
+    """
+    global _stats_report_cache
+    now = time.monotonic()
+    if _stats_report_cache is not None and now - _stats_report_cache[0] < STATS_REPORT_TTL_SECONDS:
+        return _stats_report_cache[1]
 
     # Собираем статистику
     user_stats = user_manager.get_stats()
     filter_stats = filter_manager.get_stats()
     history_stats = history_manager.get_stats()
     priority_stats = priority_manager.get_priority_stats()
+    bot_stats = statistics_manager.stats
     
     uptime = statistics_manager.get_uptime()
     
-    stats_message = (
+    report = (
         f"📊 *Статистика бота*\n\n"
         
         f"👥 *Пользователи:*\n"
@@ -2016,39 +2720,43 @@ async def stats_command(message: Message):
         f"• Средний интервал: {priority_stats['average_interval']} мин\n\n"
         
         f"📈 *Активность:*\n"
-        f"• Всего проверок: {statistics_manager.stats['total_checks']}\n"
-        f"• Найдено релизов: {statistics_manager.stats['total_releases_found']}\n"
-        f"• Отправлено уведомлений: {statistics_manager.stats['total_notifications_sent']}\n"
-        f"• Ошибок: {statistics_manager.stats['errors_count']}\n\n"
+        f"• Всего проверок: {bot_stats['total_checks']}\n"
+        f"• Найдено релизов: {bot_stats['total_releases_found']}\n"
+        f"• Отправлено уведомлений: {bot_stats['total_notifications_sent']}\n"
+        f"• Ошибок: {bot_stats['errors_count']}\n\n"
         
         f"📅 *История:*\n"
         f"• Релизов в базе: {history_stats['total_releases']}\n"
         f"• За последние 7 дней: {history_stats['releases_last_7_days']}\n\n"
         
         f"⏱️ *Время работы:* {uptime}\n"
-        f"🔄 *Последняя активность:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     )
 
-    await message.answer(stats_message, parse_mode="Markdown")
+    _stats_report_cache = (now, report)
+    return report
+
+async def stats_command(message: Message):
+    """Обработчик команды /stats"""
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
+        return
+
+    logger.info(f"📊 Администратор запрашивает статистику")
+
+    stats_message = f"{get_stats_report()}🔄 *Последняя активность:* {now_str()}"
+
+    await message.answer(stats_message, parse_mode=_MD)
 
 async def priority_command(message: Message):
     """Обработчик команды /priority"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"📊 Администратор запрашивает приоритеты репозиториев")
 
-    # Сначала синхронизируемся с базой данных
-    try:
-        priority_manager.initialize_priorities()
-        logger.info("✅ Приоритеты синхронизированы с БД для команды /priority")
-    except Exception as e:
-        logger.warning(f"Не удалось синхронизировать приоритеты с БД: {e}")
-
+    # Приоритеты в памяти загружены из БД при запуске и содержат все последующие
+    # изменения (в том числе еще не записанные), поэтому повторно читать БД не нужно
     priority_info = "📊 *Приоритеты репозиториев:*\n\n"
 
     # Добавляем информацию об источнике данных
@@ -2057,15 +2765,8 @@ async def priority_command(message: Message):
     else:
         priority_info += "⚠️ *Источник:* Локальные данные (БД недоступна)\n\n"
 
-    # Сортируем репозитории по приоритету (сначала высокий)
-    sorted_repos = sorted(
-        REPOS, 
-        key=lambda repo: priority_manager.get_priority(repo)['priority_score'],
-        reverse=True
-    )
-
-    for repo in sorted_repos:
-        priority_data = priority_manager.get_priority(repo)
+    # Репозитории по приоритету (сначала высокий)
+    for repo, priority_data in priority_manager.repos_by_priority():
         interval = priority_data['check_interval']
         score = priority_data['priority_score']
         failures = priority_data.get('consecutive_failures', 0)
@@ -2106,15 +2807,12 @@ async def priority_command(message: Message):
         f"⚠️ Проблемы с подключением"
     )
 
-    await message.answer(priority_info, parse_mode="Markdown")
+    await message.answer(priority_info, parse_mode=_MD, link_preview_options=_NOPREV)
 
 async def sync_command(message: Message):
     """Обработчик команды /sync - принудительная синхронизация с БД"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"🔄 Администратор запрашивает синхронизацию с БД")
@@ -2125,11 +2823,12 @@ async def sync_command(message: Message):
         
         # Проверяем доступность Supabase
         if not priority_manager.supabase_manager:
-            await sync_msg.edit_text("❌ Supabase недоступен. Проверьте настройки подключения.", parse_mode="Markdown")
+            await sync_msg.edit_text("❌ Supabase недоступен. Проверьте настройки подключения.", parse_mode=_MD)
             return
         
-        # Синхронизируем приоритеты
-        priority_manager.initialize_priorities()
+        # Записываем отложенные изменения, затем перечитываем приоритеты из БД
+        await priority_manager.flush()
+        await priority_manager.initialize_priorities()
         
         # Получаем обновленную статистику
         priority_stats = priority_manager.get_priority_stats()
@@ -2149,25 +2848,22 @@ async def sync_command(message: Message):
             f"• Статус: {sync_text}\n"
             f"• Репозиториев: {priority_stats['total_repos']}\n"
             f"• Средний интервал: {priority_stats['average_interval']} мин\n\n"
-            f"🔄 *Последнее обновление:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            f"🔄 *Последнее обновление:* {now_str()}"
         )
         
         # Обновляем сообщение
-        await sync_msg.edit_text(success_message, parse_mode="Markdown")
+        await sync_msg.edit_text(success_message, parse_mode=_MD)
         logger.info("✅ Синхронизация с БД завершена успешно")
         
     except Exception as e:
         error_message = f"❌ *Ошибка синхронизации:* {str(e)}"
-        await sync_msg.edit_text(error_message, parse_mode="Markdown")
+        await sync_msg.edit_text(error_message, parse_mode=_MD)
         logger.error(f"❌ Ошибка синхронизации с БД: {e}")
 
 async def pstats_command(message: Message):
     """Обработчик команды /pstats"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"📈 Администратор запрашивает статистику приоритетов")
@@ -2219,15 +2915,12 @@ async def pstats_command(message: Message):
         f"• Низкий приоритет: ≤{PRIORITY_THRESHOLD_LOW}"
     )
 
-    await message.answer(stats_message, parse_mode="Markdown")
+    await message.answer(stats_message, parse_mode=_MD)
 
 async def checkall_command(message: Message):
     """Обработчик команды /checkall"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"🔄 Администратор запускает принудительную проверку всех репозиториев")
@@ -2235,25 +2928,26 @@ async def checkall_command(message: Message):
     status_message = await message.answer(
         "🔄 *Запуск принудительной проверки всех репозиториев...*\n\n"
         "⏳ Это может занять несколько минут. Пожалуйста, подождите.",
-        parse_mode="Markdown"
+        parse_mode=_MD
     )
 
     try:
         # Запускаем проверку
-        start_time = datetime.now()
-        await check_all_repositories(message.bot)
+        result = await check_all_repositories(message.bot)
         end_time = datetime.now()
-        
-        duration = (end_time - start_time).total_seconds()
-        
+
+        duration = result['duration']
+        throughput = result['repos_checked'] / duration if duration > 0 else 0.0
+
         await status_message.edit_text(
             f"✅ *Принудительная проверка завершена*\n\n"
-            f"⏱️ Время выполнения: {duration:.1f} сек\n"
-            f"📦 Проверено репозиториев: {len(REPOS)}\n"
+            f"⏱️ Время выполнения: {duration:.1f} сек ({throughput:.1f} репоз./сек)\n"
+            f"📦 Проверено репозиториев: {result['repos_checked']} из {len(REPOS)}\n"
+            f"🆕 Найдено обновлений: {result['repos_with_updates']}\n"
             f"🕒 Завершено: {end_time.strftime('%H:%M:%S')}\n\n"
             f"Результаты проверки записаны в логи. "
             f"Используйте /stats для просмотра общей статистики.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
     
     except Exception as e:
@@ -2262,57 +2956,68 @@ async def checkall_command(message: Message):
             f"❌ *Ошибка при проверке репозиториев*\n\n"
             f"Произошла ошибка: `{str(e)[:200]}`\n\n"
             f"Проверьте логи для получения подробной информации.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
 
+# Файлы, попадающие в резервную копию /backup и ежедневную автоматическую копию
+BACKUP_FILES = (STATE_FILE, FILTERS_FILE, HISTORY_FILE, USERS_FILE, STATISTICS_FILE)
+
+def create_backup_archive() -> Tuple[str, List[str]]:
+    """Упаковывает существующие файлы данных в один архив backup_<время>.tar.gz
+
+    Returns:
+        Tuple[str, List[str]]: Путь к архиву и имена упакованных файлов
+    """
+    backup_timestamp = time.strftime("%Y%m%d_%H%M%S")
+    archive_path = os.path.join(BACKUP_DIR, f"backup_{backup_timestamp}.tar.gz")
+
+    with tarfile.open(archive_path, 'w:gz') as tar:
+        for file_path in BACKUP_FILES:
+            if os.path.exists(file_path):
+                tar.add(file_path, arcname=os.path.basename(file_path))
+        backed_up_files = tar.getnames()
+
+    if not backed_up_files:
+        os.remove(archive_path)
+
+    return archive_path, backed_up_files
+
+async def scheduled_backup():
+    """Ежедневная автоматическая резервная копия файлов данных"""
+    try:
+        archive_path, backed_up_files = await asyncio.to_thread(create_backup_archive)
+        if backed_up_files:
+            logger.info(f"💾 Создана резервная копия {archive_path}: {', '.join(backed_up_files)}")
+    except Exception as e:
+        logger.error(f"Ошибка автоматического резервного копирования: {e}")
+
 async def backup_command(message: Message):
     """Обработчик команды /backup для создания резервных копий"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"💾 Администратор создает резервные копии")
 
     try:
-        # Создаем папку для резервных копий с датой
-        backup_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_folder = os.path.join(BACKUP_DIR, f"backup_{backup_timestamp}")
-        os.makedirs(backup_folder, exist_ok=True)
-
-        files_to_backup = [
-            STATE_FILE,
-            FILTERS_FILE,
-            HISTORY_FILE,
-            USERS_FILE,
-            STATISTICS_FILE
-        ]
-
-        backed_up_files = []
-        
-        for file_path in files_to_backup:
-            if os.path.exists(file_path):
-                backup_path = os.path.join(backup_folder, os.path.basename(file_path))
-                shutil.copy2(file_path, backup_path)
-                backed_up_files.append(os.path.basename(file_path))
+        # Архивирование выполняем в отдельном потоке, чтобы не блокировать event loop
+        archive_path, backed_up_files = await asyncio.to_thread(create_backup_archive)
 
         if backed_up_files:
             await message.answer(
                                 f"💾 *Резервная копия создана*\n\n"
-                f"📁 Папка: `{backup_folder}`\n"
+                f"📁 Архив: `{archive_path}`\n"
                 f"📋 Файлы: {', '.join(backed_up_files)}\n"
-                f"🕒 Время создания: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                f"✅ Всего файлов скопировано: {len(backed_up_files)}",
-                parse_mode="Markdown"
+                f"🕒 Время создания: {now_str()}\n\n"
+                f"✅ Всего файлов в архиве: {len(backed_up_files)}",
+                parse_mode=_MD
             )
         else:
             await message.answer(
                 "⚠️ *Внимание*\n\n"
                 "Не найдено файлов для резервного копирования.\n"
                 "Возможно, бот запущен впервые или файлы данных отсутствуют.",
-                parse_mode="Markdown"
+                parse_mode=_MD
             )
 
     except Exception as e:
@@ -2321,175 +3026,211 @@ async def backup_command(message: Message):
             f"❌ *Ошибка создания резервной копии*\n\n"
             f"Произошла ошибка: `{str(e)[:200]}`\n\n"
             f"Проверьте права доступа к файловой системе.",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
 
 # --- ДОПОЛНИТЕЛЬНЫЕ СЛУЖЕБНЫЕ КОМАНДЫ ---
 
+SYSTEM_USAGE_TTL = 5  # секунд
+
+@functools.lru_cache(maxsize=1)
+def _read_system_usage(_time_bucket: int):
+    return psutil.virtual_memory(), psutil.disk_usage('.')
+
+def get_system_usage():
+    """Возвращает (virtual_memory, disk_usage), кэшируя показания на SYSTEM_USAGE_TTL секунд"""
+    return _read_system_usage(int(time.monotonic() // SYSTEM_USAGE_TTL))
+
+def get_process_peak_rss_mb() -> Optional[float]:
+    """Пиковый объем памяти процесса бота в МБ
+
+    На POSIX - один вызов getrusage без чтения /proc, на Windows - через psutil.
+    """
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux возвращает килобайты, macOS - байты
+        return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+    if psutil is not None:
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    return None
+
 async def debug_command(message: Message):
     """Обработчик команды /debug для отладочной информации"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"🐛 Администратор запрашивает отладочную информацию")
 
     try:
         # Информация о системе
-        import psutil
-        import sys
-        
-        memory_info = psutil.virtual_memory()
-        disk_info = psutil.disk_usage('.')
-        
-        debug_info = (
+        parts = [(
             f"🐛 *Отладочная информация*\n\n"
             
             f"💻 *Система:*\n"
             f"• Python: {sys.version.split()[0]}\n"
             f"• Платформа: {sys.platform}\n"
-            f"• ОЗУ: {memory_info.percent}% использовано\n"
-            f"• Диск: {disk_info.percent}% использовано\n\n"
-            
-            f"📁 *Файлы данных:*\n"
-        )
-        
-        data_files = [
-            (STATE_FILE, "Состояние релизов"),
-            (FILTERS_FILE, "Фильтры пользователей"),
-            (HISTORY_FILE, "История релизов"),
-            (USERS_FILE, "База пользователей"),
-            (STATISTICS_FILE, "Статистика бота")
-        ]
+        )]
+
+        rss_mb = get_process_peak_rss_mb()
+        if rss_mb is not None:
+            parts.append(f"• Память бота (пик): {rss_mb:.1f} МБ\n")
+
+        if psutil is not None:
+            memory_info, disk_info = get_system_usage()
+            parts.append(f"• ОЗУ: {memory_info.percent}% использовано\n")
+            parts.append(f"• Диск: {disk_info.percent}% использовано\n")
+        else:
+            parts.append(f"⚠️ Модуль psutil не установлен, данные об ОЗУ и диске недоступны\n")
+
+        parts.append(f"\n📁 *Файлы данных:*\n")
         
-        for file_path, description in data_files:
-            if os.path.exists(file_path):
-                size = os.path.getsize(file_path)
-                modified = datetime.fromtimestamp(os.path.getmtime(file_path))
-                debug_info += f"✅ {description}: {size:,} байт ({modified.strftime('%d.%m %H:%M')})\n"
-            else:
-                debug_info += f"❌ {description}: файл отсутствует\n"
+        for file_path, description in DATA_FILES_INFO:
+            # Один stat вместо exists + getsize + getmtime
+            try:
+                st = os.stat(file_path)
+            except FileNotFoundError:
+                parts.append(f"❌ {description}: файл отсутствует\n")
+                continue
+
+            modified = datetime.fromtimestamp(st.st_mtime)
+            parts.append(f"✅ {description}: {st.st_size:,} байт ({modified.strftime('%d.%m %H:%M')})\n")
         
         # Информация о GitHub API
-        debug_info += f"\n🔗 *GitHub API:*\n"
+        parts.append(f"\n🔗 *GitHub API:*\n")
         if GITHUB_TOKEN:
-            debug_info += f"✅ Токен настроен (длина: {len(GITHUB_TOKEN)} символов)\n"
+            parts.append(f"✅ Токен настроен (длина: {len(GITHUB_TOKEN)} символов)\n")
         else:
-            debug_info += f"⚠️ Токен не настроен (возможны ограничения)\n"
+            parts.append(f"⚠️ Токен не настроен (возможны ограничения)\n")
         
         # Статус планировщика
-        debug_info += f"\n⏰ *Планировщик:*\n"
-        try:
-            from apscheduler.schedulers.asyncio import AsyncIOScheduler
-            debug_info += f"✅ Модуль планировщика доступен\n"
-        except ImportError:
-            debug_info += f"❌ Модуль планировщика недоступен\n"
-        
-        # Статус Supabase
-        debug_info += f"\n🗄️ *Supabase:*\n"
-        try:
-            from supabase_config import SupabaseManager
-            supabase = SupabaseManager()
-            debug_info += f"✅ SupabaseManager доступен\n"
+        # AsyncIOScheduler импортируется при загрузке модуля, поэтому всегда доступен
+        parts.append(f"\n⏰ *Планировщик:*\n")
+        parts.append(f"✅ Модуль планировщика доступен\n")
+        
+        # Статус Supabase (используем уже созданный SupabaseManager)
+        parts.append(f"\n🗄️ *Supabase:*\n")
+        supabase = priority_manager.supabase_manager
+        if supabase:
+            parts.append(f"✅ SupabaseManager доступен\n")
             if supabase.supabase_url:
-                debug_info += f"• URL: {supabase.supabase_url[:30]}...\n"
+                parts.append(f"• URL: {supabase.supabase_url[:30]}...\n")
             if supabase.supabase_key:
-                debug_info += f"• Ключ: {supabase.supabase_key[:10]}...\n"
-        except ImportError:
-            debug_info += f"❌ Модуль Supabase недоступен\n"
-        except Exception as e:
-            debug_info += f"⚠️ Ошибка Supabase: {str(e)[:50]}...\n"
+                parts.append(f"• Ключ: {supabase.supabase_key[:10]}...\n")
+        else:
+            parts.append(f"❌ SupabaseManager недоступен (см. логи запуска)\n")
         
-        await message.answer(debug_info, parse_mode="Markdown")
+        await message.answer("".join(parts), parse_mode=_MD)
         
-    except ImportError:
-        await message.answer(
-            "⚠️ Модуль psutil не установлен. Отладочная информация ограничена.",
-            parse_mode="Markdown"
-        )
     except Exception as e:
         logger.error(f"Ошибка получения отладочной информации: {e}")
         await message.answer(
             f"❌ Ошибка получения отладочной информации: `{str(e)}`",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
 
+def tail_lines(path: str, n: int, block_size: int = 8192,
+               max_chars: Optional[int] = None) -> List[str]:
+    """Возвращает последние n строк файла, читая его блоками с конца
+
+    Стоимость зависит от количества возвращаемых строк, а не от размера файла.
+    Если задан max_chars, длинные строки обрезаются до max_chars символов
+    (с "..." в конце) ещё до декодирования, по байтам.
+    """
+    blocks = []
+    newlines = 0
+
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        # n+1 переводов строки гарантируют, что первая из n строк прочитана целиком
+        while pos > 0 and newlines <= n:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            block = f.read(read_size)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+
+    raw_lines = b''.join(reversed(blocks)).splitlines(keepends=True)[-n:]
+    if max_chars is None:
+        return [raw.decode('utf-8', errors='replace') for raw in raw_lines]
+
+    # Символ UTF-8 занимает не больше 4 байт: декодируем только нужный префикс
+    byte_cap = max_chars * 4 + 4
+    lines = []
+    for raw in raw_lines:
+        line = raw[:byte_cap].decode('utf-8', errors='replace')
+        lines.append(line if len(line) <= max_chars else line[:max_chars - 3] + "...\n")
+    return lines
+
 async def logs_command(message: Message):
     """Обработчик команды /logs для просмотра последних логов"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    user_manager.record_activity(message.from_user.id, 'command')
-
-    if message.from_user.id != ADMIN_ID:
-        await message.answer("⛔ У вас нет прав для выполнения этой команды.")
+    if message.from_user.id not in _ADMINS:
+        await message.answer(ACCESS_DENIED_MESSAGE)
         return
 
     logger.info(f"📋 Администратор запрашивает логи")
 
     try:
+        # Текущие файлы содержат записи за сегодня: в полночь они ротируются
         log_dir = "logs"
-        today_log = f"{log_dir}/bot_{datetime.now().strftime('%Y%m%d')}.log"
-        error_log = f"{log_dir}/errors_{datetime.now().strftime('%Y%m%d')}.log"
+        today_log = f"{log_dir}/bot.log"
+        error_log = f"{log_dir}/errors.log"
         
-        log_info = "📋 *Информация о логах*\n\n"
+        parts = ["📋 *Информация о логах*\n\n"]
         
         # Основной лог
-        if os.path.exists(today_log):
-            size = os.path.getsize(today_log)
-            log_info += f"📝 *Основной лог:* {size:,} байт\n"
+        try:
+            today_st = os.stat(today_log)
+        except FileNotFoundError:
+            today_st = None
+
+        if today_st is not None:
+            parts.append(f"📝 *Основной лог:* {today_st.st_size:,} байт\n")
             
-            # Читаем последние 10 строк
-            with open(today_log, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                last_lines = lines[-10:] if len(lines) > 10 else lines
-                
+            # Читаем последние 10 строк, ограничивая длину строки
+            last_lines = tail_lines(today_log, 10, max_chars=100)
+
             if last_lines:
-                log_info += f"\n📖 *Последние записи:*\n'''"
-                for line in last_lines:
-                    # Ограничиваем длину строки
-                    if len(line) > 100:
-                        line = line[:97] + "...\n"
-                    log_info += line
-                log_info += "```\n"
+                parts.append(f"\n📖 *Последние записи:*\n'''")
+                parts.extend(last_lines)
+                parts.append("```\n")
         else:
-            log_info += f"❌ Основной лог за сегодня не найден\n"
+            parts.append(f"❌ Основной лог за сегодня не найден\n")
         
         # Лог ошибок
-        if os.path.exists(error_log):
-            size = os.path.getsize(error_log)
-            if size > 0:
-                log_info += f"\n⚠️ *Лог ошибок:* {size:,} байт\n"
-                
-                with open(error_log, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    last_errors = lines[-5:] if len(lines) > 5 else lines
+        try:
+            error_st = os.stat(error_log)
+        except FileNotFoundError:
+            error_st = None
+
+        if error_st is not None:
+            if error_st.st_size > 0:
+                parts.append(f"\n⚠️ *Лог ошибок:* {error_st.st_size:,} байт\n")
                 
+                last_errors = tail_lines(error_log, 5, max_chars=150)
+
                 if last_errors:
-                    log_info += f"\n🚨 *Последние ошибки:*\n```"
-                    for line in last_errors:
-                        if len(line) > 150:
-                            line = line[:147] + "...\n"
-                        log_info += line
-                    log_info += "```"
+                    parts.append(f"\n🚨 *Последние ошибки:*\n```")
+                    parts.extend(last_errors)
+                    parts.append("```")
             else:
-                log_info += f"\n✅ Ошибок за сегодня не было"
+                parts.append(f"\n✅ Ошибок за сегодня не было")
         else:
-            log_info += f"\n✅ Лог ошибок не создан (ошибок не было)"
+            parts.append(f"\n✅ Лог ошибок не создан (ошибок не было)")
         
-        await message.answer(log_info, parse_mode="Markdown")
+        await message.answer("".join(parts), parse_mode=_MD)
         
     except Exception as e:
         logger.error(f"Ошибка чтения логов: {e}")
         await message.answer(
             f"❌ Ошибка чтения логов: `{str(e)}`",
-            parse_mode="Markdown"
+            parse_mode=_MD
         )
 
 async def ip_command(message: Message):
     """Проверка IP адреса"""
-    if message.from_user.id != ADMIN_ID:
+    if message.from_user.id not in _ADMINS:
         await message.answer("⛔ Доступ запрещен")
         return
 
@@ -2503,7 +3244,7 @@ async def ip_command(message: Message):
         ip_match = re.search(r'(\d+\.\d+\.\d+\.\d+)', html)
         if ip_match:
             ip = ip_match.group(1)
-            await message.answer(f"🌐 IP: `{ip}`", parse_mode="Markdown")
+            await message.answer(f"🌐 IP: `{ip}`", parse_mode=_MD)
         else:
             await message.answer("❌ Не удалось извлечь IP адрес из ответа")
         
@@ -2513,8 +3254,6 @@ async def ip_command(message: Message):
 # --- ОБРАБОТЧИК НЕИЗВЕСТНЫХ КОМАНД ---
 async def unknown_command(message: Message):
     """Обработчик неизвестных команд"""
-    user_manager.add_user(message.from_user.id, message.from_user.username)
-    
     command = message.text.split()[0] if message.text else "неизвестная команда"
     logger.info(f"❓ Пользователь {message.from_user.id} использует неизвестную команду: {command}")
     
@@ -2526,40 +3265,77 @@ async def unknown_command(message: Message):
         f"• /filter — настроить фильтры\n"
         f"• /last — последние релизы\n"
         f"• /help — полная справка",
-        parse_mode="Markdown"
+        parse_mode=_MD
     )
 
+# --- ОГРАНИЧЕНИЕ ЧАСТОТЫ ЗАПРОСОВ К TELEGRAM ---
+class TokenBucket:
+    """Общий для всего бота token bucket (Telegram допускает ~30 сообщений в секунду)"""
+
+    def __init__(self, rate: float = 28, capacity: float = 28):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def take(self):
+        """Резервирует один токен, при необходимости ожидая его появления"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Токен резервируется сразу (баланс может стать отрицательным),
+        # поэтому ожидающие запросы обслуживаются по очереди без блокировок
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+BUCKET = TokenBucket()
+
+class RateLimitMiddleware:
+    """Middleware сессии бота: пропускает исходящие запросы через общий BUCKET"""
+
+    async def __call__(self, make_request, bot, method):
+        # Long polling не расходует лимит на отправку сообщений
+        if type(method).__name__ != 'GetUpdates':
+            await BUCKET.take()
+        return await make_request(bot, method)
+
 # --- MIDDLEWARE ДЛЯ ЛОГИРОВАНИЯ ---
 class LoggingMiddleware:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
     async def __call__(self, handler, event, data):
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
         
         try:
-            # Логируем входящее событие
-            if hasattr(event, 'from_user') and event.from_user:
-                user_id = event.from_user.id
-                username = event.from_user.username or "None"
-                
-                if hasattr(event, 'text') and event.text:
-                    self.logger.info(f"📥 Сообщение от {user_id} (@{username}): {event.text[:50]}")
-                elif hasattr(event, 'data') and event.data:
-                    self.logger.info(f"📥 Callback от {user_id} (@{username}): {event.data}")
+            # Логируем входящее событие (только если INFO включен)
+            user = getattr(event, 'from_user', None) if self.logger.isEnabledFor(logging.INFO) else None
+            if user is not None:
+                user_id = user.id
+                username = user.username or "None"
+
+                text = getattr(event, 'text', None)
+                if isinstance(text, str) and text:
+                    self.logger.info("📥 Сообщение от %s (@%s): %s", user_id, username, text[:50])
+                else:
+                    callback_data = getattr(event, 'data', None)
+                    if callback_data:
+                        self.logger.info("📥 Callback от %s (@%s): %s", user_id, username, callback_data)
             
             # Выполняем обработчик
             result = await handler(event, data)
             
             # Логируем время выполнения
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
             if execution_time > 1.0:  # Логируем только медленные операции
                 self.logger.warning(f"⏱️ Медленная операция: {execution_time:.2f}с")
             
             return result
             
         except Exception as e:
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
             self.logger.error(f"❌ Ошибка в middleware: {e} (время: {execution_time:.2f}с)")
             raise
 
@@ -2577,13 +3353,13 @@ async def error_handler(event, exception):
             error_message = (
                 f"🚨 *Критическая ошибка в боте*\n\n"
                 f"❌ Ошибка: `{str(exception)[:300]}`\n"
-                f"🕒 Время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"🕒 Время: {now_str()}\n"
                 f"📍 Событие: {type(event).__name__}"
             )
             
             # Попытка отправить через существующий бот
             if hasattr(event, 'bot'):
-                await event.bot.send_message(ADMIN_ID, error_message, parse_mode="Markdown")
+                await event.bot.send_message(ADMIN_ID, error_message, parse_mode=_MD)
         except:
             pass  # Игнорируем ошибки отправки уведомлений об ошибках
 
@@ -2591,39 +3367,41 @@ async def error_handler(event, exception):
 def register_handlers(dp: Dispatcher):
     """Регистрирует все обработчики команд и событий"""
     logger.info("📝 Регистрация обработчиков команд...")
+
+    # Учет пользователей и их активности выполняется декоратором track_user
     
     # Основные команды
-    dp.message.register(start_command, CommandStart())
-    dp.message.register(help_command, Command("help"))
-    dp.message.register(donate_command, Command("donate"))
+    dp.message.register(track_user()(start_command), CommandStart())
+    dp.message.register(track_user()(help_command), Command("help"))
+    dp.message.register(track_user()(donate_command), Command("donate"))
     
     # Команды управления фильтрами
-    dp.message.register(filter_command, Command("filter"))
-    dp.message.register(myfilters_command, Command("myfilters"))
-    dp.message.register(clearfilters_command, Command("clearfilters"))
+    dp.message.register(track_user()(filter_command), Command("filter"))
+    dp.message.register(track_user()(myfilters_command), Command("myfilters"))
+    dp.message.register(track_user()(clearfilters_command), Command("clearfilters"))
     
     # Команды просмотра данных
-    dp.message.register(last_command, Command("last"))
+    dp.message.register(track_user()(last_command), Command("last"))
     
     # Административные команды
-    dp.message.register(stats_command, Command("stats"))
-    dp.message.register(priority_command, Command("priority"))
-    dp.message.register(sync_command, Command("sync"))
-    dp.message.register(pstats_command, Command("pstats"))
-    dp.message.register(checkall_command, Command("checkall"))
-    dp.message.register(backup_command, Command("backup"))
-    dp.message.register(debug_command, Command("debug"))
-    dp.message.register(logs_command, Command("logs"))
+    dp.message.register(track_user()(stats_command), Command("stats"))
+    dp.message.register(track_user()(priority_command), Command("priority"))
+    dp.message.register(track_user()(sync_command), Command("sync"))
+    dp.message.register(track_user()(pstats_command), Command("pstats"))
+    dp.message.register(track_user()(checkall_command), Command("checkall"))
+    dp.message.register(track_user()(backup_command), Command("backup"))
+    dp.message.register(track_user()(debug_command), Command("debug"))
+    dp.message.register(track_user()(logs_command), Command("logs"))
     dp.message.register(ip_command, Command("ip"))
     
     # Обработчики callback-кнопок
-    dp.callback_query.register(cancel_filter_callback, F.data == "cancel_filter")
+    dp.callback_query.register(track_user(None)(cancel_filter_callback), F.data == "cancel_filter")
     
     # Обработчик текста (для фильтров)
-    dp.message.register(process_filter_text, F.text & ~F.command)
+    dp.message.register(track_user()(process_filter_text), F.text & ~F.command)
     
     # Обработчик неизвестных команд (должен быть последним)
-    dp.message.register(unknown_command, F.text & F.text.startswith('/'))
+    dp.message.register(track_user(None)(unknown_command), F.text & F.text.startswith('/'))
     
     logger.info("✅ Все обработчики зарегистрированы")
 
@@ -2634,35 +3412,70 @@ async def cleanup_old_files():
     
     try:
         # Очистка старых логов (старше 30 дней)
+        # os.scandir отдает тип записи вместе со списком каталога,
+        # поэтому на каждый файл приходится не больше одного stat
+        # Границы считаем один раз в секундах эпохи и сравниваем с st_mtime напрямую
+        now_ts = time.time()
         log_dir = "logs"
         if os.path.exists(log_dir):
-            cutoff_date = datetime.now() - timedelta(days=30)
-            
-            for filename in os.listdir(log_dir):
-                file_path = os.path.join(log_dir, filename)
-                if os.path.isfile(file_path):
-                    file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    if file_time < cutoff_date:
-                        os.remove(file_path)
-                        logger.info(f"🗑️ Удален старый лог: {filename}")
-        
+            cutoff_ts = now_ts - 30 * 86400
+
+            with os.scandir(log_dir) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff_ts:
+                        os.remove(entry.path)
+                        logger.info(f"🗑️ Удален старый лог: {entry.name}")
+
         # Очистка старых резервных копий (старше 14 дней)
         if os.path.exists(BACKUP_DIR):
-            cutoff_date = datetime.now() - timedelta(days=14)
-            
-            for item in os.listdir(BACKUP_DIR):
-                item_path = os.path.join(BACKUP_DIR, item)
-                if os.path.isdir(item_path):
-                    item_time = datetime.fromtimestamp(os.path.getmtime(item_path))
-                    if item_time < cutoff_date:
-                        shutil.rmtree(item_path)
-                        logger.info(f"🗑️ Удалена старая резервная копия: {item}")
+            cutoff_ts = now_ts - 14 * 86400
+
+            with os.scandir(BACKUP_DIR) as entries:
+                for entry in entries:
+                    if entry.stat(follow_symlinks=False).st_mtime >= cutoff_ts:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.name.endswith('.tar.gz'):
+                        os.remove(entry.path)
+                    else:
+                        continue
+                    logger.info(f"🗑️ Удалена старая резервная копия: {entry.name}")
+
+        # Очистка кэша ответов GitHub (записи, не подтверждавшиеся 30 дней)
+        removed = release_cache.cleanup(30 * 86400)
+        if removed:
+            logger.info(f"🗑️ Удалено устаревших записей кэша: {removed}")
         
         logger.info("✅ Очистка старых файлов завершена")
         
     except Exception as e:
         logger.error(f"❌ Ошибка при очистке старых файлов: {e}")
 
+# --- РЕЗЕРВНЫЕ КОПИИ .BAK ---
+# Файлы, которые сохраняются атомарно и получают .bak не при каждой записи, а по расписанию
+SNAPSHOT_FILES = (STATE_FILE, USERS_FILE, FILTERS_FILE, HISTORY_FILE)
+
+def snapshot_data_files():
+    """Обновляет резервные копии .bak для файлов из SNAPSHOT_FILES
+
+    Файлы, не изменившиеся с момента предыдущей копии, не копируются.
+    """
+    for file_path in SNAPSHOT_FILES:
+        backup_path = f"{file_path}.bak"
+        try:
+            # copy2 сохраняет mtime, поэтому равные времена означают актуальную копию
+            if os.stat(file_path).st_mtime <= os.stat(backup_path).st_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        try:
+            shutil.copy2(file_path, backup_path)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.error(f"Не удалось обновить резервную копию {file_path}: {e}")
+
 # --- ФУНКЦИЯ ПРОВЕРКИ ЗДОРОВЬЯ БОТА ---
 async def health_check():
     """Проверяет состояние бота и его компонентов"""
@@ -2671,32 +3484,47 @@ async def health_check():
     issues = []
     
     try:
-        # Проверка файлов данных
+        # Все обращения к диску выполняем параллельно в пуле потоков,
+        # чтобы медленная файловая система не блокировала цикл событий
         required_files = [STATE_FILE, USERS_FILE]
-        for file_path in required_files:
-            if not os.path.exists(file_path):
+        stat_tasks = [asyncio.to_thread(os.stat, p) for p in (*required_files, HISTORY_FILE)]
+        if psutil is not None:
+            stat_tasks.append(asyncio.to_thread(get_system_usage))
+        results = await asyncio.gather(*stat_tasks, return_exceptions=True)
+
+        # Проверка файлов данных
+        for file_path, st in zip(required_files, results):
+            if isinstance(st, FileNotFoundError):
                 issues.append(f"Отсутствует обязательный файл: {file_path}")
+            elif isinstance(st, BaseException):
+                raise st
         
         # Проверка размера файлов истории
-        if os.path.exists(HISTORY_FILE):
-            size = os.path.getsize(HISTORY_FILE)
-            if size > 50 * 1024 * 1024:  # 50 МБ
-                issues.append(f"Файл истории слишком большой: {size // 1024 // 1024} МБ")
+        history_st = results[len(required_files)]
+        if isinstance(history_st, FileNotFoundError):
+            size = 0
+        elif isinstance(history_st, BaseException):
+            raise history_st
+        else:
+            size = history_st.st_size
+        if size > 50 * 1024 * 1024:  # 50 МБ
+            issues.append(f"Файл истории слишком большой: {size // 1024 // 1024} МБ")
         
         # Проверка статистики ошибок
-        error_rate = statistics_manager.stats.get('errors_count', 0)
-        total_checks = statistics_manager.stats.get('total_checks', 1)
+        bot_stats = statistics_manager.stats
+        error_rate = bot_stats.get('errors_count', 0)
+        total_checks = bot_stats.get('total_checks', 1)
         if error_rate / max(total_checks, 1) > 0.1:  # Более 10% ошибок
             issues.append(f"Высокий уровень ошибок: {error_rate}/{total_checks}")
         
         # Проверка дискового пространства
-        try:
-            import psutil
-            disk_usage = psutil.disk_usage('.')
+        if psutil is not None:
+            usage = results[-1]
+            if isinstance(usage, BaseException):
+                raise usage
+            _, disk_usage = usage
             if disk_usage.percent > 90:
                 issues.append(f"Мало места на диске: {disk_usage.percent}%")
-        except ImportError:
-            pass
         
         if issues:
             logger.warning(f"⚠️ Обнаружены проблемы: {'; '.join(issues)}")
@@ -2740,6 +3568,9 @@ async def main():
     bot = Bot(token=BOT_TOKEN)
     dp = Dispatcher()
 
+    # Все исходящие запросы проходят через общий ограничитель частоты
+    bot.session.middleware(RateLimitMiddleware())
+
     # Добавляем middleware для логирования
     dp.message.middleware(LoggingMiddleware())
     dp.callback_query.middleware(LoggingMiddleware())
@@ -2756,26 +3587,67 @@ async def main():
     
     scheduler = AsyncIOScheduler(timezone="UTC")
     
-    # Основная задача проверки репозиториев (каждые 15 минут)
+    # Основная задача проверки репозиториев: после каждого запуска
+    # переносится на ближайший срок проверки (интервал - запасной вариант)
     scheduler.add_job(
         check_repositories,
         'interval',
-        minutes=15,
-        kwargs={'bot': bot},
+        minutes=MIN_CHECK_INTERVAL_MINUTES,
+        kwargs={'bot': bot, 'scheduler': scheduler},
         id='repositories_check',
         max_instances=1,  # Предотвращаем одновременный запуск
         coalesce=True    # Объединяем пропущенные запуски
     )
 
-    # Обновление приоритетов (каждые 6 часов)
+    # Обновление приоритетов (каждые 6 часов); корутина выполняется в цикле событий,
+    # а не в пуле потоков планировщика, поэтому не конкурирует с record_check
     scheduler.add_job(
-        lambda: priority_manager.update_priorities(history_manager),
+        priority_manager.update_priorities,
         'interval',
         hours=6,
+        args=(history_manager,),
         id='priority_update',
         max_instances=1
     )
 
+    # Отложенная запись приоритетов в БД (каждую минуту)
+    scheduler.add_job(
+        priority_manager.flush,
+        'interval',
+        minutes=1,
+        id='priority_flush',
+        max_instances=1,
+        coalesce=True
+    )
+
+    # Старение счетчиков обращений кэша GitHub (каждый час)
+    scheduler.add_job(
+        release_cache.decay,
+        'interval',
+        hours=1,
+        id='release_cache_decay',
+        max_instances=1
+    )
+
+    # Резервные копии .bak файлов данных (каждый час)
+    scheduler.add_job(
+        snapshot_data_files,
+        'interval',
+        hours=1,
+        id='snapshot_data_files',
+        max_instances=1
+    )
+
+    # Резервная копия файлов данных (каждый день в 02:30)
+    scheduler.add_job(
+        scheduled_backup,
+        'cron',
+        hour=2,
+        minute=30,
+        id='daily_backup',
+        max_instances=1
+    )
+
     # Очистка старых файлов (каждый день в 03:00)
     scheduler.add_job(
         cleanup_old_files,
@@ -2797,7 +3669,7 @@ async def main():
 
     # Сохранение статистики (каждые 30 минут)
     scheduler.add_job(
-        lambda: statistics_manager._save_stats(),
+        statistics_manager._save_stats,
         'interval',
         minutes=30,
         id='save_statistics',
@@ -2824,9 +3696,11 @@ async def main():
         print(f"❌ Ошибка инициализации приоритетов: {e}")
         # Продолжаем работу с локальными данными
 
+    repo_count = len(REPOS)
+
     # Выводим информацию о конфигурации
     print(f"\n📊 КОНФИГУРАЦИЯ БОТА:")
-    print(f"├── Отслеживается репозиториев: {len(REPOS)}")
+    print(f"├── Отслеживается репозиториев: {repo_count}")
     print(f"├── GitHub токен: {'✅ Настроен' if GITHUB_TOKEN else '❌ Не настроен'}")
     print(f"├── Канал для уведомлений: {'✅ ' + CHANNEL_ID if CHANNEL_ID else '❌ Не настроен'}")
     print(f"├── Администратор: {'✅ ID=' + str(ADMIN_ID) if ADMIN_ID else '❌ Не настроен'}")
@@ -2866,17 +3740,21 @@ async def main():
                 logger.warning(f"Не удалось получить IP адрес: {e}")
                 ip_address = "Ошибка получения"
             
+            user_count = user_manager.get_count()
+            filter_count = filter_manager.get_users_with_filters_count()
+            history_count = history_manager.get_count()
+
             startup_message = (
                 f"🚀 *Бот успешно запущен!*\n\n"
-                f"⏰ Время запуска: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                f"📦 Отслеживается репозиториев: {len(REPOS)}\n"
-                f"👥 Пользователей в базе: {user_manager.get_count()}\n"
-                f"🔍 Пользователей с фильтрами: {filter_manager.get_users_with_filters_count()}\n"
-                f"📈 Релизов в истории: {history_manager.get_count()}\n"
+                f"⏰ Время запуска: {now_str()}\n"
+                f"📦 Отслеживается репозиториев: {repo_count}\n"
+                f"👥 Пользователей в базе: {user_count}\n"
+                f"🔍 Пользователей с фильтрами: {filter_count}\n"
+                f"📈 Релизов в истории: {history_count}\n"
                 f"🌐 Внешний IP: `{ip_address}`\n\n"
                 f"Бот готов к работе! 🎉"
             )
-            await bot.send_message(ADMIN_ID, startup_message, parse_mode="Markdown")
+            await bot.send_message(ADMIN_ID, startup_message, parse_mode=_MD)
         except Exception as e:
             logger.warning(f"Не удалось отправить уведомление о запуске админу: {e}")
 
@@ -2918,6 +3796,7 @@ async def main():
         print(f"\n❌ Критическая ошибка: {e}")
         print("Проверьте логи для получения подробной информации")
     finally:
+        stopped_at = now_str()
         logger.info("🛑 Завершение работы бота...")
         print("🛑 Завершение работы бота...")
         
@@ -2929,40 +3808,60 @@ async def main():
         except Exception as e:
             logger.error(f"Ошибка остановки планировщика: {e}")
 
+        # Записываем отложенные изменения пользователей, фильтров и истории
+        user_manager._saver.flush()
+        filter_manager._saver.flush()
+        history_manager._saver.flush()
+
         # Сохраняем финальную статистику
         try:
+            statistics_manager._saver.flush()
             statistics_manager._save_stats()
             logger.info("💾 Финальная статистика сохранена")
             print("💾 Финальная статистика сохранена")
         except Exception as e:
             logger.error(f"Ошибка сохранения статистики: {e}")
 
-        # Закрываем сессию бота
+        # Дожидаемся, пока фоновый поток запишет файлы данных на диск
+        await asyncio.to_thread(close_file_writer)
+
+        # Записываем отложенные изменения приоритетов
         try:
-            await bot.session.close()
-            logger.info("🔌 Сессия бота закрыта")
-            print("🔌 Сессия бота закрыта")
+            await priority_manager.flush()
+            logger.info("💾 Приоритеты сохранены")
         except Exception as e:
-            logger.error(f"Ошибка закрытия сессии: {e}")
+            logger.error(f"Ошибка сохранения приоритетов: {e}")
 
-        # Уведомляем админа об остановке
+        # Закрываем общую сессию GitHub API и кэш ответов
+        try:
+            await close_github_session()
+        except Exception as e:
+            logger.error(f"Ошибка закрытия сессии GitHub: {e}")
+        release_cache.close()
+
+        # Уведомляем админа об остановке, пока сессия бота еще открыта
         if ADMIN_ID:
             try:
                 shutdown_message = (
                     f"🛑 *Бот остановлен*\n\n"
-                    f"⏰ Время остановки: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"⏰ Время остановки: {stopped_at}\n"
                     f"📊 Время работы: {statistics_manager.get_uptime()}\n"
                     f"📈 Всего проверок: {statistics_manager.stats['total_checks']}\n"
                     f"🔔 Всего уведомлений: {statistics_manager.stats['total_notifications_sent']}\n\n"
                     f"До свидания! 👋"
                 )
-                # Создаем новую сессию для отправки последнего сообщения
-                final_bot = Bot(token=BOT_TOKEN)
-                await final_bot.send_message(ADMIN_ID, shutdown_message, parse_mode="Markdown")
-                await final_bot.session.close()
+                await bot.send_message(ADMIN_ID, shutdown_message, parse_mode=_MD)
             except:
                 pass  # Игнорируем ошибки при завершении
 
+        # Закрываем сессию бота
+        try:
+            await bot.session.close()
+            logger.info("🔌 Сессия бота закрыта")
+            print("🔌 Сессия бота закрыта")
+        except Exception as e:
+            logger.error(f"Ошибка закрытия сессии: {e}")
+
         logger.info("✅ Бот полностью остановлен")
         print("✅ Бот полностью остановлен")
 
@@ -2970,6 +3869,15 @@ async def main():
 if __name__ == "__main__":
     try:
         logger.info("🚀 Запуск приложения...")
+
+        # Цикл событий на libuv быстрее стандартного (если uvloop установлен)
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("⚡ Используется uvloop")
+        except ImportError:
+            pass
+
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Бот остановлен пользователем")
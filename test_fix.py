@@ -38,7 +38,7 @@ async def test_fix():
         
         # Инициализируем приоритеты
         print("\n🔄 Инициализация приоритетов...")
-        priority_manager.initialize_priorities()
+        await priority_manager.initialize_priorities()
         print(f"✅ Приоритеты инициализированы: {len(priority_manager.priorities)} репозиториев")
         
         # Проверяем запись информации о проверке
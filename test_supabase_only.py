@@ -38,7 +38,7 @@ async def test_supabase_only():
         
         # Тестируем загрузку приоритетов из БД
         print("\n🔄 Загрузка приоритетов из базы данных...")
-        priority_manager.initialize_priorities()
+        await priority_manager.initialize_priorities()
         
         # Проверяем загруженные данные
         print(f"📊 Загружено приоритетов: {len(priority_manager.priorities)}")